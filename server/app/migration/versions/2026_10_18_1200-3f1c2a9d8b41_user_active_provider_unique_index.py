@@ -0,0 +1,31 @@
+"""user active provider unique index
+
+Revision ID: 3f1c2a9d8b41
+Revises: 
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d8b41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_user_oauth_provider_provider_user_id_active",
+        "user",
+        ["oauth_provider", "provider_user_id"],
+        unique=True,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_oauth_provider_provider_user_id_active", table_name="user")
@@ -0,0 +1,37 @@
+"""journal user_id journal_time_at index
+
+Revision ID: 8c5e2b7d4a19
+Revises: 3f1c2a9d8b41
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '8c5e2b7d4a19'
+down_revision = '3f1c2a9d8b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built without locking out journal writes on a large table
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_journal_user_id_journal_time_at",
+            "journal",
+            ["user_id", "journal_time_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_journal_user_id_journal_time_at",
+            table_name="journal",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,39 @@
+"""journal daily summary
+
+Revision ID: d2a7f4c91e36
+Revises: 8c5e2b7d4a19
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7f4c91e36'
+down_revision = '8c5e2b7d4a19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by `python -m src.core.scripts.backfill_journal_daily_summary`
+    op.create_table(
+        "journal_daily_summary",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("journal_count", sa.Integer(), nullable=False),
+        sa.Column("mood_counts", sa.JSON(), nullable=False),
+        sa.Column("mood_micro_status_id", sa.Integer(), nullable=True),
+        sa.Column("mood_macro_status_id", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["mood_micro_status_id"], ["mood_micro_status.id"]),
+        sa.ForeignKeyConstraint(["mood_macro_status_id"], ["mood_macro_status.id"]),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("journal_daily_summary")
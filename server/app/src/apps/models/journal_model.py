@@ -1,6 +1,7 @@
 from typing import List, Optional
 from enum import Enum
 from datetime import datetime, date
+from sqlalchemy import ForeignKey, Index, Integer, JSON
 from sqlmodel import SQLModel, Column, Text, Field, Relationship, ARRAY, String
 from ...core.base_model import BaseIDModel
 
@@ -46,12 +47,47 @@ class JournalBase(SQLModel):
 
 class Journal(BaseIDModel, JournalBase, table=True):
     __tablename__ = "journal"
+    __table_args__ = (
+        # Month and date-range calendar reads of one user
+        Index("ix_journal_user_id_journal_time_at", "user_id", "journal_time_at"),
+    )
 
     images: Optional[List[str]] = Field(sa_column=Column(ARRAY(String)), nullable=True)
     user_id: Optional[int] = Field(default=None, foreign_key="user.id")
-    updated_at: datetime | None = Field(default_factory=datetime.now)
+    # Bumped on every UPDATE, the ETag of the journal detail relies on it
+    updated_at: datetime | None = Field(
+        default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now}
+    )
 
     user: Optional["User"] = Relationship(back_populates="journal")
     mood_macro: Optional["MoodMacroStatus"] = Relationship(back_populates="journal")
     mood_micro: Optional["MoodMicroStatus"] = Relationship(back_populates="journal")
-    
\ No newline at end of file
+
+
+class JournalDailySummary(SQLModel, table=True):
+    """
+    One row per user and day that has journals, kept in step with `journal` by
+    `JournalRepository`: the journal count, the count of every (micro, macro)
+    mood pair and the day's representative (most frequent) mood.
+    """
+
+    __tablename__ = "journal_daily_summary"
+
+    user_id: int = Field(
+        sa_column=Column(
+            Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+        )
+    )
+    day: date = Field(primary_key=True)
+    journal_count: int = Field(default=0, nullable=False)
+    # [{"mood_micro_status_id", "mood_macro_status_id", "count"}], most frequent first
+    mood_counts: List[dict] = Field(default=[], sa_column=Column(JSON, nullable=False))
+    mood_micro_status_id: Optional[int] = Field(
+        default=None, foreign_key="mood_micro_status.id", nullable=True
+    )
+    mood_macro_status_id: Optional[int] = Field(
+        default=None, foreign_key="mood_macro_status.id", nullable=True
+    )
+    updated_at: datetime | None = Field(
+        default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now}
+    )
@@ -12,6 +12,7 @@ class MoodMacroStatus(BaseIDModel, table=True):
     mood_macro: str
     mood_micro: List["MoodMicroStatus"] = Relationship(back_populates="mood_macro")
     journal: "Journal" = Relationship(back_populates="mood_macro")
+    profile: List["Profile"] = Relationship(back_populates="mood_macro")  # noqa: F821
 
 
 class MoodMicroStatus(BaseIDModel, table=True):
@@ -22,4 +23,5 @@ class MoodMicroStatus(BaseIDModel, table=True):
         foreign_key="mood_macro_status.id", nullable=False
     )
     mood_macro: MoodMacroStatus = Relationship(back_populates="mood_micro")
-    journal: "Journal" = Relationship(back_populates="mood_micro")
\ No newline at end of file
+    journal: "Journal" = Relationship(back_populates="mood_micro")
+    profile: List["Profile"] = Relationship(back_populates="mood_micro")  # noqa: F821
\ No newline at end of file
@@ -13,6 +13,7 @@ from sqlmodel import (
     JSON,
     UniqueConstraint
 )
+from sqlalchemy import Index, text
 
 from ...core.base_model import BaseIDModel
 from .journal_model import Journal
@@ -46,12 +47,25 @@ class UserBase(SQLModel):
 
 class User(BaseIDModel, UserBase, table=True):
     __tablename__ = "user"
+    __table_args__ = (
+        # ON CONFLICT target of the OAuth login upsert; withdrawn rows may repeat
+        Index(
+            "ix_user_oauth_provider_provider_user_id_active",
+            "oauth_provider",
+            "provider_user_id",
+            unique=True,
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     # hashed_password : str | None = Field(nullable=False, index=True)
     role: Optional["Role"] = Relationship(
         back_populates="user", sa_relationship_kwargs={"lazy": "joined"}
     )
     journal: List["Journal"] = Relationship(back_populates="user")
+    profile: Optional["Profile"] = Relationship(
+        back_populates="user", sa_relationship_kwargs={"uselist": False}
+    )
 
 
 """
@@ -15,7 +15,7 @@ class CommunityRepository(BaseRepository[UserSuggestion, ISubjectSuggestionCreat
         subject_id: int,
         db_session: AsyncSession | None = None,
     ) -> UserSuggestion | None:
-        db_session = db_session or super().get_db().session
+        db_session = db_session or self.get_read_db_session()
         response = await db_session.execute(
             select(self.model.recommended_user_ids).where((self.model.user_id == user_id)
             & (self.model.subject_id == subject_id))
@@ -30,7 +30,7 @@ class CommunityRepository(BaseRepository[UserSuggestion, ISubjectSuggestionCreat
         subject_id:int,
         db_session: AsyncSession | None = None,
     ):
-        db_session = db_session or super().get_db().session
+        db_session = db_session or self.get_read_db_session()
         query = text("""
             SELECT ranking.user_id, p.nickname, p.profile_image, ranking.top_values FROM(
                 SELECT ranked_keys.user_id, ARRAY_AGG(keys) AS top_values FROM(
@@ -0,0 +1,182 @@
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg, insert
+from sqlalchemy.engine import Row
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ...core.base_repository import BaseRepository
+from ...core.db.unit_of_work import commit
+from ..models.journal_model import Journal, JournalDailySummary
+from ..schemas.journal_schemas import IJournalDailySummaryRead
+
+
+class JournalDailySummaryRepository(
+    BaseRepository[JournalDailySummary, IJournalDailySummaryRead, IJournalDailySummaryRead]
+):
+    async def refresh_days(
+        self,
+        *,
+        user_id: int,
+        days: Iterable[date | None],
+        db_session: AsyncSession | None = None,
+    ) -> None:
+        """
+        Recomputes the summaries of `days` from the user's journals, in the
+        caller's transaction. Called after every journal write.
+        """
+        db_session = db_session or super().get_db().session
+        table = self.model.__table__
+        mood_count = func.count()
+
+        # Sorted, so two refreshes never lock the same days in opposite order
+        for day in sorted({day for day in days if day is not None}):
+            day_of_user = (table.c.user_id == user_id) & (table.c.day == day)
+
+            # Locks the day's row (creating it if needed) first: a concurrent
+            # refresh of the same day waits, then sees this one's journals
+            await db_session.execute(
+                insert(table)
+                .values(user_id=user_id, day=day, journal_count=0, mood_counts=[])
+                .on_conflict_do_update(
+                    index_elements=[table.c.user_id, table.c.day],
+                    set_={"journal_count": table.c.journal_count},
+                )
+            )
+            response = await db_session.execute(
+                select(
+                    Journal.mood_micro_status_id,
+                    Journal.mood_macro_status_id,
+                    mood_count.label("count"),
+                )
+                .where((Journal.user_id == user_id) & (Journal.journal_time_at == day))
+                .group_by(Journal.mood_micro_status_id, Journal.mood_macro_status_id)
+                .order_by(
+                    mood_count.desc(),
+                    Journal.mood_micro_status_id,
+                    Journal.mood_macro_status_id,
+                )
+            )
+            mood_counts = [dict(row._mapping) for row in response]
+
+            if not mood_counts:
+                await db_session.execute(delete(table).where(day_of_user))
+                continue
+
+            await db_session.execute(
+                update(table)
+                .where(day_of_user)
+                .values(
+                    journal_count=sum(mood["count"] for mood in mood_counts),
+                    mood_counts=mood_counts,
+                    mood_micro_status_id=mood_counts[0]["mood_micro_status_id"],
+                    mood_macro_status_id=mood_counts[0]["mood_macro_status_id"],
+                )
+            )
+        await commit(db_session)
+
+    async def get_by_range(
+        self,
+        *,
+        user_id: int,
+        start: date,
+        end: date,
+        db_session: AsyncSession | None = None,
+    ) -> list[Row]:
+        """
+        `(day, journal_count, mood_micro_status_id, mood_macro_status_id)` of
+        every day with journals in `[start, end)`, by day
+        """
+        db_session = db_session or self.get_read_db_session()
+        response = await db_session.execute(
+            select(
+                self.model.day,
+                self.model.journal_count,
+                self.model.mood_micro_status_id,
+                self.model.mood_macro_status_id,
+            )
+            .where(
+                (self.model.user_id == user_id)
+                & (self.model.day >= start)
+                & (self.model.day < end)
+            )
+            .order_by(self.model.day)
+        )
+        return response.all()
+
+    async def backfill(
+        self, *, user_ids: list[int], db_session: AsyncSession | None = None
+    ) -> list[Row]:
+        """
+        Builds the missing summaries of `user_ids` from their journals in one
+        statement and returns the `(user_id, day)` of those created. Existing
+        rows are kept: journal writes keep them complete.
+        """
+        db_session = db_session or super().get_db().session
+        table = self.model.__table__
+
+        counts = (
+            select(
+                Journal.user_id,
+                Journal.journal_time_at.label("day"),
+                Journal.mood_micro_status_id,
+                Journal.mood_macro_status_id,
+                func.count().label("count"),
+            )
+            .where(Journal.user_id.in_(user_ids))
+            .group_by(
+                Journal.user_id,
+                Journal.journal_time_at,
+                Journal.mood_micro_status_id,
+                Journal.mood_macro_status_id,
+            )
+            .subquery()
+        )
+        order = (
+            counts.c.count.desc(),
+            counts.c.mood_micro_status_id,
+            counts.c.mood_macro_status_id,
+        )
+        summaries = select(
+            counts.c.user_id,
+            counts.c.day,
+            func.sum(counts.c.count),
+            func.json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        "mood_micro_status_id", counts.c.mood_micro_status_id,
+                        "mood_macro_status_id", counts.c.mood_macro_status_id,
+                        "count", counts.c.count,
+                    ),
+                    *order,
+                )
+            ),
+            array_agg(aggregate_order_by(counts.c.mood_micro_status_id, *order))[1],
+            array_agg(aggregate_order_by(counts.c.mood_macro_status_id, *order))[1],
+        ).group_by(counts.c.user_id, counts.c.day)
+
+        response = await db_session.execute(
+            insert(table)
+            .from_select(
+                [
+                    "user_id",
+                    "day",
+                    "journal_count",
+                    "mood_counts",
+                    "mood_micro_status_id",
+                    "mood_macro_status_id",
+                ],
+                summaries,
+            )
+            .on_conflict_do_nothing(index_elements=[table.c.user_id, table.c.day])
+            .returning(table.c.user_id, table.c.day)
+        )
+        created = response.all()
+        await commit(db_session)
+        return created
+
+
+def get_journal_daily_summary_repository() -> JournalDailySummaryRepository:
+    return JournalDailySummaryRepository(JournalDailySummary)
@@ -1,14 +1,209 @@
+from collections import defaultdict
+from collections.abc import Iterable
 from datetime import date
+from typing import Any
 from uuid import UUID
 
-from sqlmodel import select, text, func
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 from ...core.base_repository import BaseRepository
+from ...core.db.unit_of_work import on_commit
 from ..models.journal_model import Journal
 from ..schemas.journal_schemas import IJournalCreate, IJournalUpdate
+from ..services.journal_cache_service import journal_cache_service
+from .journal_daily_summary_repository import get_journal_daily_summary_repository
 
 
 class JournalRepository(BaseRepository[Journal, IJournalCreate, IJournalUpdate]):
+    async def create(
+        self,
+        *,
+        obj_in: IJournalCreate | Journal,
+        created_by_id: UUID | str | int | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> Journal:
+        db_session = db_session or super().get_db().session
+        journal = await super().create(
+            obj_in=obj_in, created_by_id=created_by_id, db_session=db_session
+        )
+        await get_journal_daily_summary_repository().refresh_days(
+            user_id=journal.user_id, days=[journal.journal_time_at], db_session=db_session
+        )
+        await on_commit(
+            db_session,
+            lambda: journal_cache_service.invalidate(
+                journal.user_id, journal.journal_time_at
+            ),
+        )
+        return journal
+
+    async def update(
+        self,
+        *,
+        obj_current: Journal,
+        obj_new: IJournalUpdate | dict[str, Any] | Journal,
+        db_session: AsyncSession | None = None,
+    ) -> Journal:
+        db_session = db_session or super().get_db().session
+        # Moving a journal to another day changes both months
+        previous_user_id = obj_current.user_id
+        previous_day = obj_current.journal_time_at
+        journal = await super().update(
+            obj_current=obj_current, obj_new=obj_new, db_session=db_session
+        )
+        summary_repository = get_journal_daily_summary_repository()
+        if previous_user_id == journal.user_id:
+            # One call, so both days are locked in a consistent order
+            await summary_repository.refresh_days(
+                user_id=journal.user_id,
+                days=[previous_day, journal.journal_time_at],
+                db_session=db_session,
+            )
+        else:
+            await summary_repository.refresh_days(
+                user_id=previous_user_id, days=[previous_day], db_session=db_session
+            )
+            await summary_repository.refresh_days(
+                user_id=journal.user_id,
+                days=[journal.journal_time_at],
+                db_session=db_session,
+            )
+
+        async def invalidate():
+            await journal_cache_service.invalidate(previous_user_id, previous_day)
+            await journal_cache_service.invalidate(journal.user_id, journal.journal_time_at)
+
+        await on_commit(db_session, invalidate)
+        return journal
+
+    async def remove(
+        self, *, id: UUID | str | int, db_session: AsyncSession | None = None
+    ) -> Journal:
+        db_session = db_session or super().get_db().session
+        journal = await super().remove(id=id, db_session=db_session)
+        await get_journal_daily_summary_repository().refresh_days(
+            user_id=journal.user_id, days=[journal.journal_time_at], db_session=db_session
+        )
+        await on_commit(
+            db_session,
+            lambda: journal_cache_service.invalidate(
+                journal.user_id, journal.journal_time_at
+            ),
+        )
+        return journal
+
+    async def _refresh_summaries(
+        self, days: Iterable[tuple[int, date]], db_session: AsyncSession
+    ) -> None:
+        """
+        Recomputes the summaries of the `(user_id, day)` pairs a bulk write
+        touched and invalidates those users' cached months once committed.
+        """
+        days_by_user: dict[int, set[date]] = defaultdict(set)
+        for user_id, day in days:
+            days_by_user[user_id].add(day)
+
+        summary_repository = get_journal_daily_summary_repository()
+        # By user, so two bulk writes lock the summaries in the same order
+        for user_id in sorted(days_by_user):
+            await summary_repository.refresh_days(
+                user_id=user_id, days=days_by_user[user_id], db_session=db_session
+            )
+
+        async def invalidate():
+            for user_id, user_days in days_by_user.items():
+                await journal_cache_service.invalidate(user_id, *user_days)
+
+        await on_commit(db_session, invalidate)
+
+    async def _lock_matching(
+        self,
+        ids: list[UUID | str | int] | None,
+        where: list[ColumnElement] | None,
+        db_session: AsyncSession,
+    ) -> list[tuple[int, int, date]]:
+        # `(id, user_id, journal_time_at)` before the write: the bulk statement
+        # then targets these ids only, so no row escapes the summary refresh
+        response = await db_session.execute(
+            select(Journal.id, Journal.user_id, Journal.journal_time_at)
+            .where(*self._bulk_where(ids, where))
+            .with_for_update()
+        )
+        return response.all()
+
+    async def create_many(
+        self,
+        *,
+        objs_in: list[IJournalCreate | Journal],
+        db_session: AsyncSession | None = None,
+    ) -> list[Journal]:
+        db_session = db_session or super().get_db().session
+        journals = await super().create_many(objs_in=objs_in, db_session=db_session)
+        await self._refresh_summaries(
+            [(journal.user_id, journal.journal_time_at) for journal in journals],
+            db_session,
+        )
+        return journals
+
+    async def copy_many(
+        self,
+        *,
+        objs_in: list[IJournalCreate | Journal],
+        db_session: AsyncSession | None = None,
+    ) -> int:
+        db_session = db_session or super().get_db().session
+        rows = [self._to_row(obj_in) for obj_in in objs_in]
+        copied = await super().copy_many(objs_in=objs_in, db_session=db_session)
+        await self._refresh_summaries(
+            [(row["user_id"], row["journal_time_at"]) for row in rows], db_session
+        )
+        return copied
+
+    async def update_many(
+        self,
+        *,
+        values: dict[str, Any],
+        ids: list[UUID | str | int] | None = None,
+        where: list[ColumnElement] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> list[Journal]:
+        db_session = db_session or super().get_db().session
+        previous = await self._lock_matching(ids, where, db_session)
+        if not previous:
+            return []
+
+        journals = await super().update_many(
+            values=values, ids=[id for id, _, _ in previous], db_session=db_session
+        )
+        # Moving journals to other days or users changes both sides
+        await self._refresh_summaries(
+            [(user_id, day) for _, user_id, day in previous]
+            + [(journal.user_id, journal.journal_time_at) for journal in journals],
+            db_session,
+        )
+        return journals
+
+    async def delete_many(
+        self,
+        *,
+        ids: list[UUID | str | int] | None = None,
+        where: list[ColumnElement] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> list[UUID | str | int]:
+        db_session = db_session or super().get_db().session
+        previous = await self._lock_matching(ids, where, db_session)
+        if not previous:
+            return []
+
+        deleted_ids = await super().delete_many(
+            ids=[id for id, _, _ in previous], db_session=db_session
+        )
+        await self._refresh_summaries(
+            [(user_id, day) for _, user_id, day in previous], db_session
+        )
+        return deleted_ids
+
     async def get_by_specified_date(
         self,
         *,
@@ -17,7 +212,7 @@ class JournalRepository(BaseRepository[Journal, IJournalCreate, IJournalUpdate])
         end_date: date,
         db_session: AsyncSession | None = None,
     ) -> Journal | None:
-        db_session = db_session or super().get_db().session
+        db_session = db_session or self.get_read_db_session()
         query = select(
             self.model.journal_time_at,
             func.json_agg(
@@ -36,51 +231,37 @@ class JournalRepository(BaseRepository[Journal, IJournalCreate, IJournalUpdate])
 
         return response.all()
 
-    def get_by_month_query(self, *, user_id: int, date: date):
-        client_date = date.strftime("%Y-%m")
-        query = select(Journal).where(
-            (text("TO_CHAR(created_at, 'YYYY-MM') LIKE :year_month")).params(
-                year_month=f"{client_date}%"
-            )
-            & (Journal.user_id == user_id)
-        )
-        return query
-    
+    def _get_month_range(self, day: date) -> tuple[date, date]:
+        """
+        First day of the month and first day of the next one, for half-open
+        range predicates an index on the column can serve
+        """
+        start = day.replace(day=1)
+        if start.month == 12:
+            return start, start.replace(year=start.year + 1, month=1)
+        return start, start.replace(month=start.month + 1)
+
     def get_by_month_query_with_journal_time_at(self, *, user_id: int, date: date):
-        client_date = date.strftime("%Y-%m")
+        start, end = self._get_month_range(date)
         query = select(Journal).where(
-            (text("TO_CHAR(journal_time_at, 'YYYY-MM') LIKE :year_month")).params(
-                year_month=f"{client_date}%"
-            )
-            & (Journal.user_id == user_id)
+            (Journal.user_id == user_id)
+            & (Journal.journal_time_at >= start)
+            & (Journal.journal_time_at < end)
         )
         return query
 
     async def get_by_month(
         self, *, user_id: int, date: date, db_session: AsyncSession | None = None
     ) -> list[Journal]:
-        db_session = db_session or super().get_db().session
+        db_session = db_session or self.get_read_db_session()
         query = self.get_by_month_query_with_journal_time_at(user_id=user_id, date=date)
         response = await db_session.execute(query)
         return response.scalars().all()
 
-    async def remove(
-        self, *, id: UUID | str, db_session: AsyncSession | None = None
-    ) -> Journal:
-        db_session = db_session or super().get_db().session
-        response = await db_session.execute(
-            select(self.model).where(self.model.id == id)
-        )
-        obj = response.scalar_one()
-
-        await db_session.delete(obj)
-        await db_session.commit()
-        return obj
-
     async def count_total_journal(
         self, *, user_id: int, db_session: AsyncSession | None = None
     ) -> int:
-        db_session = db_session or super().get_db().session
+        db_session = db_session or self.get_read_db_session()
         
         count_query = select(func.count()).select_from(Journal).where(Journal.user_id == user_id)
         count_result = await db_session.execute(count_query)
@@ -14,7 +14,7 @@ class MoodMicroStatusRepository(
     async def find_mood_macro_id_with_micro_id(
         self, *, db_session: AsyncSession | None = None
     ) -> MoodMicroStatus | None:
-        db_session = db_session or super().get_db().session
+        db_session = db_session or self.get_read_db_session()
         query = select(MoodMicroStatus)
 
         # response = await db_session.execute(query)
@@ -26,7 +26,7 @@ class MoodMicroStatusRepository(
     ) -> MoodMicroStatus | None:
         logger.info(f"get_mood_micro_status_by_id id: {id}")
         
-        db_session = db_session or super().get_db().session
+        db_session = db_session or self.get_read_db_session()
         mood_obj = await db_session.execute(select(MoodMicroStatus).where(MoodMicroStatus.id == id))
         
         try:
@@ -3,6 +3,7 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ...core.base_repository import BaseRepository
+from ...core.db.unit_of_work import commit
 
 from ..schemas.profile_schema import IProfileCreate, IProfileUpdate, IModifyProfile
 from ..models.user_model import Profile
@@ -53,7 +54,7 @@ class ProfileRepository(BaseRepository[Profile, IProfileCreate, IProfileUpdate])
 
         profile.feed_image = feed_images if len(feed_images) != 0 else None
         db_session.add(profile)
-        await db_session.commit()
+        await commit(db_session)
 
     async def modify_profile(
         self,
@@ -95,7 +96,7 @@ class ProfileRepository(BaseRepository[Profile, IProfileCreate, IProfileUpdate])
             profile.open_keyword = {**profile.open_keyword, **open_keyword_dict} if profile.open_keyword is not None else open_keyword_dict
 
         db_session.add(profile)
-        await db_session.commit()
+        await commit(db_session)
 
 
 def get_profile_repository() -> ProfileRepository:
@@ -1,11 +1,16 @@
+from typing import Any
+from uuid import UUID
+
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 
 from ...core.base_repository import BaseRepository
+from ...core.db.unit_of_work import commit, on_commit
 
 from ..schemas.role_schema import IRoleCreate, IRoleUpdate
 from ..models.role_model import Role
 from ..models.user_model import User
+from ..services.catalog_service import catalog_cache
 
 
 class RoleRepository(BaseRepository[Role, IRoleCreate, IRoleUpdate]):
@@ -16,12 +21,48 @@ class RoleRepository(BaseRepository[Role, IRoleCreate, IRoleUpdate]):
         role = await db_session.execute(select(Role).where(Role.name == name))
         return role.scalar_one_or_none()
 
+    async def create(
+        self,
+        *,
+        obj_in: IRoleCreate | Role,
+        created_by_id: UUID | str | int | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> Role:
+        db_session = db_session or super().get_db().session
+        role = await super().create(
+            obj_in=obj_in, created_by_id=created_by_id, db_session=db_session
+        )
+        await on_commit(db_session, catalog_cache.publish_change)
+        return role
+
+    async def update(
+        self,
+        *,
+        obj_current: Role,
+        obj_new: IRoleUpdate | dict[str, Any] | Role,
+        db_session: AsyncSession | None = None,
+    ) -> Role:
+        db_session = db_session or super().get_db().session
+        role = await super().update(
+            obj_current=obj_current, obj_new=obj_new, db_session=db_session
+        )
+        await on_commit(db_session, catalog_cache.publish_change)
+        return role
+
+    async def remove(
+        self, *, id: UUID | str | int, db_session: AsyncSession | None = None
+    ) -> Role:
+        db_session = db_session or super().get_db().session
+        role = await super().remove(id=id, db_session=db_session)
+        await on_commit(db_session, catalog_cache.publish_change)
+        return role
+
     async def add_role_to_user(self, *, user: User, role_id: int) -> Role:
         db_session = super().get_db().session
         role = await super().get(id=role_id)
         role.user.append(user)
         db_session.add(role)
-        await db_session.commit()
+        await commit(db_session)
         await db_session.refresh(role)
         return role
 
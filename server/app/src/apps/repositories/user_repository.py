@@ -6,15 +6,23 @@ import random
 import string
 
 from pydantic.networks import EmailStr
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import noload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.expression import ColumnElement
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ...core.utils.auth.security import verify_password
 from ...core.base_repository import BaseRepository
+from ...core.db.unit_of_work import commit, on_commit
 from ...core.constants.constant import WITHDRAWL_POSTFIX
 
 from ..schemas.user_schema import IUserCreate, IUserUpdate
 from ..models.user_model import User, Profile
+from ..services.catalog_service import catalog_cache
+from ..services.user_cache_service import user_cache_service
 
 
 class UserRepository(BaseRepository[User, IUserCreate, IUserUpdate]):
@@ -54,28 +62,85 @@ class UserRepository(BaseRepository[User, IUserCreate, IUserUpdate]):
 
         return user
 
+    async def get_with_cache(self, *, id: int) -> User | None:
+        return await user_cache_service.get(id, loader=lambda: self._load_for_cache(id))
+
+    async def _load_for_cache(self, id: int) -> User | None:
+        # Loaded from the primary: the user may be attached to later writes.
+        # The role is not joined, the cache takes it from the catalog.
+        response = await self.db.session.execute(
+            select(User).where(User.id == id).options(noload(User.role))
+        )
+        return response.scalar_one_or_none()
+
     async def create_with_role(
         self, *, obj_in: IUserCreate, db_session: AsyncSession | None = None
     ) -> User:
         db_session = db_session or super().get_db().session
         db_obj = User.from_orm(obj_in)
         db_session.add(db_obj)
-        await db_session.commit()
+        await commit(db_session)
         await db_session.refresh(db_obj)
         return db_obj
 
+    async def upsert_with_profile(
+        self, *, obj_in: IUserCreate, db_session: AsyncSession | None = None
+    ) -> tuple[User, Profile]:
+        """
+        Finds or creates the active user of an OAuth account together with its
+        profile, in one transaction.
+
+        Both rows come from `INSERT ... ON CONFLICT ... RETURNING`, so concurrent
+        callbacks for the same account end up with the same user.
+        """
+        db_session = db_session or super().get_db().session
+
+        new_user = User.from_orm(obj_in)
+        user_values = {
+            c.key: getattr(new_user, c.key)
+            for c in User.__table__.columns
+            if c.key != "id"
+        }
+        user_stmt = insert(User).values(**user_values)
+        user_stmt = user_stmt.on_conflict_do_update(
+            index_elements=[User.oauth_provider, User.provider_user_id],
+            index_where=text("is_active"),
+            # No-op update, only there so RETURNING yields the existing row
+            set_={"provider_user_id": user_stmt.excluded.provider_user_id},
+        ).returning(*User.__table__.columns)
+        response = await db_session.execute(
+            select(User)
+            .from_statement(user_stmt)
+            .execution_options(populate_existing=True)
+        )
+        user = response.scalar_one()
+
+        profile_stmt = insert(Profile).values(
+            user_id=user.id, updated_at=datetime.datetime.now()
+        )
+        profile_stmt = profile_stmt.on_conflict_do_update(
+            index_elements=[Profile.user_id],
+            set_={"user_id": profile_stmt.excluded.user_id},
+        ).returning(*Profile.__table__.columns)
+        response = await db_session.execute(
+            select(Profile)
+            .from_statement(profile_stmt)
+            .execution_options(populate_existing=True)
+        )
+        profile = response.scalar_one()
+
+        # RETURNING doesn't go through the joined load of `role`
+        set_committed_value(user, "role", await catalog_cache.get_role(user.role_id))
+
+        await commit(db_session)
+        return user, profile
+
     async def update_is_active(
         self, *, db_obj: list[User], obj_in: int | str | dict[str, Any]
-    ) -> User | None:
-        response = None
-        db_session = super().get_db().session
-        for x in db_obj:
-            x.is_active = obj_in.is_active
-            db_session.add(x)
-            await db_session.commit()
-            await db_session.refresh(x)
-            response.append(x)
-        return response
+    ) -> list[User]:
+        return await self.update_many(
+            ids=[x.id for x in db_obj], values={"is_active": obj_in.is_active}
+        )
 
     async def authenticate(self, *, email: EmailStr, password: str) -> User | None:
         user = await self.get_by_email(email=email)
@@ -85,6 +150,52 @@ class UserRepository(BaseRepository[User, IUserCreate, IUserUpdate]):
             return None
         return user
 
+    async def update(
+        self,
+        *,
+        obj_current: User,
+        obj_new: IUserUpdate | dict[str, Any] | User,
+        db_session: AsyncSession | None = None,
+    ) -> User:
+        db_session = db_session or super().get_db().session
+        user = await super().update(
+            obj_current=obj_current, obj_new=obj_new, db_session=db_session
+        )
+        await on_commit(db_session, lambda: user_cache_service.invalidate(user.id))
+        return user
+
+    async def update_many(
+        self,
+        *,
+        values: dict[str, Any],
+        ids: list[UUID | str | int] | None = None,
+        where: list[ColumnElement] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> list[User]:
+        db_session = db_session or super().get_db().session
+        users = await super().update_many(
+            values=values, ids=ids, where=where, db_session=db_session
+        )
+        await on_commit(
+            db_session,
+            lambda: user_cache_service.invalidate(*[user.id for user in users]),
+        )
+        return users
+
+    async def delete_many(
+        self,
+        *,
+        ids: list[UUID | str | int] | None = None,
+        where: list[ColumnElement] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> list[UUID | str | int]:
+        db_session = db_session or super().get_db().session
+        deleted_ids = await super().delete_many(
+            ids=ids, where=where, db_session=db_session
+        )
+        await on_commit(db_session, lambda: user_cache_service.invalidate(*deleted_ids))
+        return deleted_ids
+
     async def remove(
         self, *, id: UUID | str, db_session: AsyncSession | None = None
     ) -> User:
@@ -95,7 +206,8 @@ class UserRepository(BaseRepository[User, IUserCreate, IUserUpdate]):
         obj = response.scalar_one()
 
         await db_session.delete(obj)
-        await db_session.commit()
+        await commit(db_session)
+        await on_commit(db_session, lambda: user_cache_service.invalidate(obj.id))
         return obj
 
     async def withdraw_user(
@@ -127,7 +239,8 @@ class UserRepository(BaseRepository[User, IUserCreate, IUserUpdate]):
         
         db_session.add(profile)
         
-        await db_session.commit()
+        await commit(db_session)
+        await on_commit(db_session, lambda: user_cache_service.invalidate(user_id))
 
 
 def get_user_repository() -> UserRepository:
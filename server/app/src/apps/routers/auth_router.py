@@ -10,8 +10,6 @@ from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import RedirectResponse
 
-from ..repositories.profile_repository import ProfileRepository, get_profile_repository
-
 from ...core.utils.auth.security import (
     create_token,
     get_password_hash,
@@ -20,6 +18,7 @@ from ...core.utils.auth.security import (
 )
 from ...core.common_deps import get_current_user
 from ...core.config import settings
+from ...core.db.read_routing import track_user
 from ...core.schemas.common_schema import TokenType, OauthProvider
 from ...core.schemas.response_schema import (
     IGetResponseBase,
@@ -38,13 +37,14 @@ from ..schemas.auth_schema import (
 from ..models.user_model import User
 from ..repositories.user_repository import UserRepository, get_user_repository
 from ..schemas.user_schema import IUserCreate
-from ..schemas.profile_schema import IProfileCreate
 from ..services.token_service import (
+    TokenEntry,
     TokenStorageService,
     get_token_storage_service,
 )
 
 from ...core.exceptions.common_exception import UnauthorizedException
+from ...core.exceptions.oauth_exceptions import InvalidToken
 from ...core.exceptions.http_error import HttpErrorEnum
 
 router = APIRouter()
@@ -70,7 +70,6 @@ async def external_provider_callback(
     state: str | None = None,
     oauth_client: OAuthClient = Depends(access_oauth_client),
     user_repository: UserRepository = Depends(get_user_repository),
-    profile_repository: ProfileRepository = Depends(get_profile_repository),
     token_service: TokenStorageService = Depends(get_token_storage_service),
 ) -> IGetResponseBase[ExternalCallbackResponse]:
     token_response = await oauth_client.get_tokens(code, state)
@@ -78,27 +77,25 @@ async def external_provider_callback(
     if oauth_client.provider_name == OauthProvider.kakao:
         user_info = await oauth_client.get_user_info(access_token=token_response.access_token)
 
-        user = await user_repository.get_by_provider_user_id(provider_user_id=user_info.id)
-
         # provider_user_id가 존재하지 않는 유저라면 새로 생성해서 저장
-        if user is None:
-            # TODO: 카카오의 닉네임이 아닌 "실제 이름"으로 적용
-            new_user = IUserCreate(
-                user_name=user_info.kakao_account.profile.nickname,
-                oauth_provider=oauth_client.provider_name,
-                provider_user_id=user_info.id,
-                email=user_info.kakao_account.email,
-                # gender=user_info.kakao_account.gender,
-                # birth_date=user_info.kakao_account.birthday,
-                profile_completion=False,
-            )
-            user = await user_repository.create_with_role(obj_in=new_user)
+        # TODO: 카카오의 닉네임이 아닌 "실제 이름"으로 적용
+        new_user = IUserCreate(
+            user_name=user_info.kakao_account.profile.nickname,
+            oauth_provider=oauth_client.provider_name,
+            provider_user_id=user_info.id,
+            email=user_info.kakao_account.email,
+            # gender=user_info.kakao_account.gender,
+            # birth_date=user_info.kakao_account.birthday,
+            profile_completion=False,
+        )
 
     elif oauth_client.provider_name == OauthProvider.apple:
-        public_keys = await oauth_client.get_public_key()
-        logger.debug(f'Public keys {public_keys}')
         matched_kid = jwt.get_unverified_header(token_response.id_token)["kid"]
-        matched_key = public_keys[matched_kid]
+        public_keys = await oauth_client.get_public_key(kid=matched_kid)
+        logger.debug(f'Public keys {public_keys}')
+        matched_key = public_keys.get(matched_kid)
+        if matched_key is None:
+            raise InvalidToken()
 
         logger.info(matched_key)
 
@@ -112,52 +109,47 @@ async def external_provider_callback(
 
         logger.info(f"DECODED :: {decoded}")
 
-        user = await user_repository.get_by_provider_user_id(
-            provider_user_id=decoded["sub"]
-        )
-
         # provider_user_id가 존재하지 않는 유저라면 새로 생성해서 저장
         # TODO: 애플 유저 이름 얻는 로직 추가 필요
-        if user is None:
-            new_user = IUserCreate(
-                user_name="",
-                oauth_provider=oauth_client.provider_name,
-                provider_user_id=decoded["sub"],
-                email=decoded["email"],
-                profile_completion=False,
-            )
-            user = await user_repository.create_with_role(obj_in=new_user)
+        new_user = IUserCreate(
+            user_name="",
+            oauth_provider=oauth_client.provider_name,
+            provider_user_id=decoded["sub"],
+            email=decoded["email"],
+            profile_completion=False,
+        )
 
     else:
         raise NotImplementedError("Other providers not implemented!")
 
-    profile = await profile_repository.get_by_id(user_id=user.id)
-    if profile is None:
-        new_profile = IProfileCreate(user_id=user.id)
-        profile = await profile_repository.create(obj_in=new_profile)
+    user, profile = await user_repository.upsert_with_profile(obj_in=new_user)
+    # Only known now: pins the new or updated user's next reads to the primary
+    await track_user(user.id)
 
-    # 외부 OAuth provider 에서 온 token을 redis에 저장 (api 재활용을 위해)
-    await token_service.add_valid_token_to_redis(
-        user,
-        token_response.access_token,
-        TokenType.ACCESS,
-        settings.ACCESS_TOKEN_EXPIRE_MINUTES,
-        oauth_client.provider_name,
-    )
-    await token_service.add_valid_token_to_redis(
-        user,
-        token_response.refresh_token,
-        TokenType.REFRESH,
-        settings.REFRESH_TOKEN_EXPIRE_MINUTES,
-        oauth_client.provider_name,
-    )
-
-    # 자체 OAuth token 생성 후 redis에 저장
+    # 자체 OAuth token 생성
     access_token = create_token(user.id, TokenType.ACCESS)
     refresh_token = create_token(user.id, TokenType.REFRESH)
 
-    await token_service.add_valid_token_to_redis(user, access_token, TokenType.ACCESS)
-    await token_service.add_valid_token_to_redis(user, refresh_token, TokenType.REFRESH)
+    # 외부 OAuth provider 에서 온 token(api 재활용을 위해)과 자체 token을 한 번에 redis에 저장
+    await token_service.issue_tokens(
+        user,
+        [
+            TokenEntry(
+                token_response.access_token,
+                TokenType.ACCESS,
+                settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+                oauth_client.provider_name,
+            ),
+            TokenEntry(
+                token_response.refresh_token,
+                TokenType.REFRESH,
+                settings.REFRESH_TOKEN_EXPIRE_MINUTES,
+                oauth_client.provider_name,
+            ),
+            TokenEntry(access_token, TokenType.ACCESS),
+            TokenEntry(refresh_token, TokenType.REFRESH),
+        ],
+    )
 
     data = ExternalCallbackResponse(
         access_token=access_token,
@@ -190,10 +182,10 @@ async def get_new_access_token(
 
     if payload["type"] == "refresh":
         user_id = int(payload["sub"])
-        valid_refresh_tokens = await token_service.get_valid_tokens(
-            user_id, TokenType.REFRESH
+        is_valid_refresh_token = await token_service.is_valid_token(
+            user_id, body.refresh_token, TokenType.REFRESH
         )
-        if valid_refresh_tokens and body.refresh_token not in valid_refresh_tokens:
+        if not is_valid_refresh_token:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Refresh token invalid"
             )
@@ -204,16 +196,12 @@ async def get_new_access_token(
             access_token = create_token(
                 payload["sub"], TokenType.ACCESS, expires_delta=access_token_expires
             )
-            valid_access_get_valid_tokens = await token_service.get_valid_tokens(
-                user.id, TokenType.ACCESS
+            await token_service.add_valid_token_to_redis(
+                user,
+                access_token,
+                TokenType.ACCESS,
+                settings.ACCESS_TOKEN_EXPIRE_MINUTES,
             )
-            if valid_access_get_valid_tokens:
-                await token_service.add_token_to_redis(
-                    user,
-                    access_token,
-                    TokenType.ACCESS,
-                    settings.ACCESS_TOKEN_EXPIRE_MINUTES,
-                )
             return create_response(
                 data=TokenRead(access_token=access_token, token_type="bearer"),
                 message="Access token generated correctly",
@@ -233,8 +221,9 @@ async def logout(
     current_user: User = Depends(get_current_user()),
     token_service: TokenStorageService = Depends(get_token_storage_service),
 ):
-    await token_service.delete_tokens(current_user, TokenType.ACCESS)
-    await token_service.delete_tokens(current_user, TokenType.REFRESH)
+    await token_service.revoke_tokens(
+        current_user, [TokenType.ACCESS, TokenType.REFRESH]
+    )
 
     return create_response(data=None, message=f"Logged out {current_user.id} correctly")
 
@@ -275,8 +264,13 @@ async def login(
         user=user,
     )
 
-    await token_service.add_valid_token_to_redis(user, access_token, TokenType.ACCESS)
-    await token_service.add_valid_token_to_redis(user, refresh_token, TokenType.REFRESH)
+    await token_service.issue_tokens(
+        user,
+        [
+            TokenEntry(access_token, TokenType.ACCESS),
+            TokenEntry(refresh_token, TokenType.REFRESH),
+        ],
+    )
 
     return create_response(data=data, message="Login correctly")
 
@@ -326,19 +320,17 @@ async def change_password(
         user=current_user,
     )
 
-    await token_service.delete_tokens(current_user, TokenType.ACCESS)
-    await token_service.delete_tokens(current_user, TokenType.REFRESH)
-    await token_service.add_token_to_redis(
-        current_user,
-        access_token,
-        TokenType.ACCESS,
-        settings.ACCESS_TOKEN_EXPIRE_MINUTES,
-    )
-    await token_service.add_token_to_redis(
+    await token_service.issue_tokens(
         current_user,
-        refresh_token,
-        TokenType.REFRESH,
-        settings.REFRESH_TOKEN_EXPIRE_MINUTES,
+        [
+            TokenEntry(
+                access_token, TokenType.ACCESS, settings.ACCESS_TOKEN_EXPIRE_MINUTES
+            ),
+            TokenEntry(
+                refresh_token, TokenType.REFRESH, settings.REFRESH_TOKEN_EXPIRE_MINUTES
+            ),
+        ],
+        replace=True,
     )
 
     return create_response(data=data, message="New password generated")
@@ -373,15 +365,11 @@ async def login_access_token(
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
-    valid_access_tokens = await token_service.get_valid_tokens(
-        user.id, TokenType.ACCESS
+    await token_service.add_valid_token_to_redis(
+        user,
+        access_token,
+        TokenType.ACCESS,
+        settings.ACCESS_TOKEN_EXPIRE_MINUTES,
     )
-    if valid_access_tokens:
-        await token_service.add_token_to_redis(
-            user,
-            access_token,
-            TokenType.ACCESS,
-            settings.ACCESS_TOKEN_EXPIRE_MINUTES,
-        )
 
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -1,9 +1,8 @@
-from datetime import date
-import itertools
-import operator
-from typing import Any, Annotated, Optional, List
+import calendar
+from datetime import date, timedelta
+from typing import Annotated, Optional, List
 
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Body, Request
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Body, Query, Request, Response
 
 from ..models.user_model import User
 from ...core.base_service import S3Events, S3_BASE_URL
@@ -17,15 +16,42 @@ from ...core.schemas.response_schema import (
     create_response,
     create_list_response,
 )
+from ...core.utils.conditional import ConditionalRoute, check_not_modified, make_etag
 
 from ..repositories.journal_respository import JournalRepository, get_journal_repository
-from ..schemas.journal_schemas import IJournalCreate, IJournalRead, ListByMonthResponse, IJournalSpecifiedDateRead
+from ..repositories.journal_daily_summary_repository import (
+    JournalDailySummaryRepository,
+    get_journal_daily_summary_repository,
+)
+from ..schemas.journal_schemas import (
+    IJournalCreate,
+    IJournalDailySummaryRead,
+    IJournalRead,
+    ListByMonthResponse,
+    IJournalSpecifiedDateRead,
+)
 from ..models.journal_model import Journal
 from ..deps.journal_deps import s3_journal_middleware
+from ..services.journal_cache_service import journal_cache_service
 from ..models.journal_model import WithWhomEnum, TopicEnum
 
 
-router = APIRouter()
+router = APIRouter(route_class=ConditionalRoute)
+
+def _to_journal_read(journal: Journal) -> IJournalCreate:
+    """
+    Response shape of a journal, with its S3 keys under `images.detail_path`.
+    Built apart from the ORM instance: the request's unit of work would flush
+    changes made to it into the `images` column.
+    """
+    data = journal.dict()
+    if journal.images:
+        data["images"] = {
+            "base_url": S3_BASE_URL,  # base_url이 생기므로 일일히 s3 obj key와 결합할 필요강 없어짐.
+            "detail_path": journal.images,
+        }
+    return IJournalCreate(**data)
+
 
 @router.post("/sibel") # sibel 시험용 POST api 
 async def sibel_health(request: Request):
@@ -74,14 +100,7 @@ async def create_journal(
         new_journal.images = s3_obj_key_list
 
     journal = await journal_repository.create(obj_in=new_journal)
-
-    if journal.images:
-        journal.images = {
-            "base_url": S3_BASE_URL,  # base_url이 생기므로 일일히 s3 obj key와 결합할 필요강 없어짐.
-            "detail_path": s3_obj_key_list,
-        }
-
-    return create_response(data=journal)
+    return create_response(data=_to_journal_read(journal))
 
 
 @router.get("")
@@ -94,75 +113,88 @@ async def journal_start_to_end_date(
     """
     Get journal list from start date to end date
     """
-    query = await journal_repository.get_by_specified_date(
-        user_id=current_user.id, 
-        start_date=start_date, 
-        end_date=end_date
+
+    async def load_journals():
+        journals = await journal_repository.get_by_specified_date(
+            user_id=current_user.id,
+            start_date=start_date,
+            end_date=end_date
+        )
+        return [dict(journal._mapping) for journal in journals]
+
+    journal_list = await journal_cache_service.get(
+        current_user.id, "range", start_date, end_date, loader=load_journals
     )
-    
-    return create_response(data=query)
+    return create_response(data=journal_list)
 
 
 @router.get("/month")
 async def read_journal_list(
     date: date,
-    journal_repository: JournalRepository = Depends(get_journal_repository),
+    journal_daily_summary_repository: JournalDailySummaryRepository = Depends(
+        get_journal_daily_summary_repository
+    ),
     current_user: User = Depends(get_current_user()),
 ) -> IGetResponseBase[list[ListByMonthResponse]]:
     """
     Get journal list by month
     """
 
-    def group_data(data: list, key: Any):
-        sorted_data = sorted(data, key=key)
-        return itertools.groupby(sorted_data, key=key)
+    async def load_month():
+        moods = await journal_daily_summary_repository.get_by_range(
+            user_id=current_user.id, start=month_start, end=next_month_start
+        )
+        return [
+            {
+                "journal_time_at": str(mood.day),
+                "mood_micro_status_id": mood.mood_micro_status_id,
+                "mood_macro_status_id": mood.mood_macro_status_id,
+            }
+            for mood in moods
+        ]
+
+    # Keyed by the month, whatever day of it the client sent
+    month_start = date.replace(day=1)
+    month_end = date.replace(day=calendar.monthrange(date.year, date.month)[1])
+    next_month_start = month_end + timedelta(days=1)
+    result = await journal_cache_service.get(
+        current_user.id, "month", month_start, month_end, loader=load_month
+    )
+    return create_response(data=result)
 
-    journal_list = await journal_repository.get_by_month(user_id=current_user.id, date=date)
-    journal_list = [journal.dict() for journal in journal_list]
 
-    date_grouped_data = group_data(journal_list, key=operator.itemgetter("journal_time_at"))
+@router.get("/year")
+async def read_journal_year(
+    year: int = Query(ge=1, le=9998),
+    journal_daily_summary_repository: JournalDailySummaryRepository = Depends(
+        get_journal_daily_summary_repository
+    ),
+    current_user: User = Depends(get_current_user()),
+) -> IGetResponseBase[list[IJournalDailySummaryRead]]:
+    """
+    Get the journal count and representative mood of every day of a year
+    that has journals (year heatmap)
+    """
+    year_start = date(year, 1, 1)
+    year_end = date(year, 12, 31)
 
-    # TODO: 필요에 따라 최적화
-    result = []
-    for key, date_group in date_grouped_data:
-        mood_date_grouped_data = group_data(
-            list(date_group),
-            key=lambda x: (x["mood_micro_status_id"], x["mood_macro_status_id"]),
+    async def load_year():
+        summaries = await journal_daily_summary_repository.get_by_range(
+            user_id=current_user.id, start=year_start, end=date(year + 1, 1, 1)
         )
+        return [dict(summary._mapping) for summary in summaries]
 
-        mood_key_len = []
-        for mood_key, mood_value in mood_date_grouped_data:
-            diaries = sorted(list(mood_value), key=lambda x: x["journal_time_at"])
-            journal_recent_created_at = diaries[-1]["journal_time_at"]
-            journal_len = len(diaries)
-
-            mood_key_len.append(
-                {
-                    "mood_micro_status_id": mood_key[0],
-                    "mood_macro_status_id": mood_key[1],
-                    "journal_time_at": journal_recent_created_at,
-                    "length": journal_len,
-                }
-            )
-
-        sorted_mood_key = sorted(mood_key_len, key=lambda x: -x["length"])
-
-        representing_mood = sorted_mood_key[0]
-
-        mood_value = {
-            "journal_time_at": str(key),
-            "mood_micro_status_id": representing_mood["mood_micro_status_id"],
-            "mood_macro_status_id": representing_mood["mood_macro_status_id"],
-        }
-
-        result.append(mood_value)
-
+    result = await journal_cache_service.get(
+        current_user.id, "year", year_start, year_end, loader=load_year
+    )
     return create_response(data=result)
 
 
 @router.get("/detail")
 async def read_one_journal(
     journal_id: int,
+    request: Request,
+    response: Response,
     journal_repository: JournalRepository = Depends(get_journal_repository),
     current_user: User = Depends(get_current_user()),
 ) -> IGetResponseBase[IJournalCreate]:
@@ -174,13 +206,17 @@ async def read_one_journal(
     if not selected_journal:
         raise IdNotFoundException(Journal, id=journal_id)
 
-    if selected_journal.images:
-        selected_journal.images = {
-            "base_url": S3_BASE_URL,
-            "detail_path": selected_journal.images,
-        }
+    if selected_journal.updated_at is not None:
+        not_modified = check_not_modified(
+            request,
+            response,
+            etag=make_etag(selected_journal.id, selected_journal.updated_at, S3_BASE_URL),
+            last_modified=selected_journal.updated_at,
+        )
+        if not_modified:
+            return not_modified
 
-    return create_response(data=selected_journal)
+    return create_response(data=_to_journal_read(selected_journal))
 
 
 @router.put("")  # TODO: 아직 context만 수정 가능하다던가, 아무거나 수정가능하다거나 정해지지 않아서 러프하게 짜놓음
@@ -244,13 +280,7 @@ async def update_journal(
         obj_current=selected_journal, obj_new=updated_journal
     )
 
-    if updated_context.images:
-        updated_context.images = {
-            "base_url": S3_BASE_URL,
-            "detail_path": updated_context.images,
-        }
-
-    return create_response(data=updated_context)
+    return create_response(data=_to_journal_read(updated_context))
 
 
 @router.delete("")
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends
+
+from ...core.common_deps import get_current_user
+from ...core.db.redis import get_redis_client
+from ...core.db.session import get_engines
+from ...core.db.slow_query_log import get_slow_queries
+from ...core.schemas.response_schema import IGetResponseBase, create_response
+
+from ..schemas.role_schema import IRoleEnum
+from ..schemas.monitor_schema import IRedisPoolStats, IDbPoolStats, ISlowQuery
+from ..models.user_model import User
+
+router = APIRouter()
+
+
+@router.get("/redis-pool")
+async def get_redis_pool_stats(
+    current_user: User = Depends(get_current_user(required_roles=[IRoleEnum.admin])),
+) -> IGetResponseBase[IRedisPoolStats]:
+    """
+    Gets connection usage of this worker's Redis pool
+
+    Required roles:
+    - admin
+    """
+    redis_client = await get_redis_client()
+    return create_response(data=redis_client.connection_pool.get_stats())
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(
+    current_user: User = Depends(get_current_user(required_roles=[IRoleEnum.admin])),
+) -> IGetResponseBase[dict[str, IDbPoolStats]]:
+    """
+    Gets connection usage of this worker's database pools, keyed by engine
+    (primary, and replica when configured)
+
+    Required roles:
+    - admin
+    """
+    return create_response(
+        data={name: engine.pool.get_stats() for name, engine in get_engines().items()}
+    )
+
+
+@router.get("/slow-queries")
+async def get_slow_queries_log(
+    current_user: User = Depends(get_current_user(required_roles=[IRoleEnum.admin])),
+) -> IGetResponseBase[list[ISlowQuery]]:
+    """
+    Gets this worker's most recent statements slower than the configured
+    threshold, with redacted binds, the calling repository method and the
+    EXPLAIN plan once it has been captured
+
+    Required roles:
+    - admin
+    """
+    return create_response(data=get_slow_queries())
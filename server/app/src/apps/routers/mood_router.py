@@ -9,32 +9,33 @@ from ...core.schemas.response_schema import (
     create_list_response,
 )
 
+from ..models.mood_model import MoodMicroStatus
 from ..models.user_model import User
 from ...core.common_deps import get_current_user
+from ...core.utils.conditional import ConditionalRoute
 from ..schemas.mood_schemas import IMoodMicroRead
-from ..repositories.mood_repository import (
-    MoodMicroStatusRepository,
-    get_mood_micro_repository,
-)
+from ..services.catalog_service import catalog_cache
 
 
-router = APIRouter()
+router = APIRouter(route_class=ConditionalRoute)
 
 
 @router.get("/macro_and_micro_id")
 async def get_mood_macro(
     params: Params = Depends(),
     current_user: User = Depends(get_current_user()),
-    mood_micro_repository: MoodMicroStatusRepository = Depends(
-        get_mood_micro_repository
-    ),
 ) -> IGetResponsePaginated[IMoodMicroRead]:
     """
     Get mood macro & micro id
     """
-    query = await mood_micro_repository.find_mood_macro_id_with_micro_id()
-    mood_micro_list = await mood_micro_repository.get_multi_paginated(
-        query=query, params=params
-    )
+    mood_micro_list = catalog_cache.get_all(MoodMicroStatus)
+    offset = params.size * (params.page - 1)
 
-    return create_list_response(data=mood_micro_list)
+    return create_list_response(
+        data=IGetResponsePaginated.create(
+            items=mood_micro_list[offset : offset + params.size],
+            total=len(mood_micro_list),
+            params=params,
+        ),
+        meta={"catalog_version": catalog_cache.version},
+    )
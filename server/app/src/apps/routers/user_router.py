@@ -1,7 +1,6 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, status
-from fastapi_pagination import Params
 
 from ...core.common_deps import get_current_user
 from ...core.exceptions.user_exceptions import UserSelfDeleteException
@@ -10,8 +9,11 @@ from ...core.schemas.response_schema import (
     IGetResponseBase,
     IGetResponsePaginated,
     IPostResponseBase,
+    CursorParams,
     create_response,
+    create_list_response,
 )
+from ...core.utils.conditional import ConditionalRoute
 
 from ..schemas.role_schema import IRoleEnum
 from ..schemas.user_schema import IUserCreate, IUserRead, IUserUpdate
@@ -19,7 +21,7 @@ from ..models.user_model import User
 from ..repositories.user_repository import UserRepository, get_user_repository
 from ..deps import user_deps as user_deps
 
-router = APIRouter()
+router = APIRouter(route_class=ConditionalRoute)
 
 
 @router.get("")
@@ -121,7 +123,7 @@ Below Currently Deprecated
 @router.get("/list", deprecated=True)
 async def read_users_list(
     user_repository: UserRepository = Depends(get_user_repository),
-    params: Params = Depends(),
+    params: CursorParams = Depends(),
     current_user: User = Depends(
         get_current_user(required_roles=[IRoleEnum.admin, IRoleEnum.founder])
     ),
@@ -129,18 +131,20 @@ async def read_users_list(
     """
     Retrieve users. Requires admin or founder role
 
+    Pass the `next_cursor` of a page as `cursor` to get the following one.
+
     Required roles:
     - admin
     - founder
     """
-    users = await user_repository.get_multi_paginated(params=params)
-    return create_response(data=users)
+    users = await user_repository.get_multi_cursor_paginated(params=params)
+    return create_list_response(data=users)
 
 
 @router.get("/order_by_created_at", deprecated=True)
 async def get_user_list_order_by_created_at(
     user_repository: UserRepository = Depends(get_user_repository),
-    params: Params = Depends(),
+    params: CursorParams = Depends(),
     current_user: User = Depends(
         get_current_user(required_roles=[IRoleEnum.admin, IRoleEnum.founder])
     ),
@@ -148,11 +152,13 @@ async def get_user_list_order_by_created_at(
     """
     Gets a paginated list of users ordered by created datetime
 
+    Pass the `next_cursor` of a page as `cursor` to get the following one.
+
     Required roles:
     - admin
     - founder
     """
-    users = await user_repository.get_multi_paginated_ordered(
+    users = await user_repository.get_multi_cursor_paginated(
         params=params, order_by="created_at"
     )
-    return create_response(data=users)
+    return create_list_response(data=users)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from .routers import journal_router, mood_router, auth_router, role_router, user_router, community_router
+from .routers import journal_router, mood_router, auth_router, role_router, user_router, community_router, monitor_router
 
 
 api_router = APIRouter()
@@ -11,3 +11,4 @@ api_router.include_router(user_router.router, prefix="/user", tags=["user"])
 api_router.include_router(journal_router.router, prefix="/journal", tags=["journal"])
 api_router.include_router(mood_router.router, prefix="/mood", tags=["mood"])
 api_router.include_router(community_router.router, prefix="/community", tags=["community"])
+api_router.include_router(monitor_router.router, prefix="/monitor", tags=["monitor"])
@@ -49,3 +49,10 @@ class ListByMonthResponse(BaseModel):
     journal_time_at: str
     mood_micro_status_id: int
     mood_macro_status_id: int
+
+
+class IJournalDailySummaryRead(BaseModel):
+    day: date
+    journal_count: int
+    mood_micro_status_id: int | None
+    mood_macro_status_id: int | None
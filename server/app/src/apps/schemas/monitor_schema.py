@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class IRedisPoolStats(BaseModel):
+    max_connections: int
+    created: int
+    in_use: int
+    idle: int
+    wait_count: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class IDbPoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    wait_count: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class ISlowQuery(BaseModel):
+    engine: str
+    statement: str
+    parameters: list[str | None] | dict[str, str | None]
+    caller: str | None
+    duration_ms: float
+    occurred_at: datetime
+    plan: Any | None
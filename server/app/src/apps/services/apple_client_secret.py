@@ -0,0 +1,153 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import boto3
+from jose import jwt
+from loguru import logger
+
+from ...core.config import settings
+
+
+class AppleAuthKeySource(ABC):
+    """
+    Where the Sign in with Apple private key (.p8 contents) is read from.
+    """
+
+    @abstractmethod
+    async def load(self) -> str:
+        ...
+
+
+class SecretsManagerKeySource(AppleAuthKeySource):
+    def __init__(self, secret_id: str, region_name: str):
+        self.secret_id = secret_id
+        self.region_name = region_name
+
+    def _fetch(self) -> str:
+        session = boto3.session.Session()
+        client = session.client(
+            service_name="secretsmanager", region_name=self.region_name
+        )
+        # Decrypts secret using the associated KMS key.
+        return client.get_secret_value(SecretId=self.secret_id)["SecretString"]
+
+    async def load(self) -> str:
+        # boto3 is blocking, keep it off the event loop
+        return await asyncio.to_thread(self._fetch)
+
+
+class FileKeySource(AppleAuthKeySource):
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    async def load(self) -> str:
+        return await asyncio.to_thread(self.path.read_text)
+
+
+class EnvKeySource(AppleAuthKeySource):
+    def __init__(self, private_key: str):
+        self.private_key = private_key
+
+    async def load(self) -> str:
+        return self.private_key
+
+
+def get_apple_auth_key_source() -> AppleAuthKeySource:
+    if settings.APPLE_AUTH_KEY_SOURCE == "file":
+        return FileKeySource(settings.APPLE_AUTH_KEY_PATH)
+    if settings.APPLE_AUTH_KEY_SOURCE == "env":
+        return EnvKeySource(settings.APPLE_AUTH_PRIVATE_KEY)
+    return SecretsManagerKeySource(settings.APPLE_AUTH_KEY, settings.AWS_DEFAULT_REGION)
+
+
+class AppleClientSecretProvider:
+    """
+    Keeps a signed Apple client secret (ES256 JWT) for most of its validity.
+
+    The private key is loaded once; a background task signs a new secret
+    `refresh_margin` seconds before the current one expires, so logins never
+    wait on the key source.
+    """
+
+    def __init__(
+        self, key_source: AppleAuthKeySource, validity: int, refresh_margin: int
+    ):
+        self.key_source = key_source
+        self.validity = validity
+        self.refresh_margin = refresh_margin
+        self._private_key: str | None = None
+        self._client_secret: str | None = None
+        self._expire_at = 0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._client_secret is not None
+            and time.time() < self._expire_at - self.refresh_margin
+        )
+
+    async def _refresh(self) -> None:
+        if self._private_key is None:
+            self._private_key = await self.key_source.load()
+
+        timestamp_now = int(time.time())
+        timestamp_exp = timestamp_now + self.validity
+        data = {
+            "iss": settings.APPLE_TEAM_ID,
+            "iat": timestamp_now,
+            "exp": timestamp_exp,
+            "aud": "https://appleid.apple.com",
+            "sub": settings.APPLE_CLIENT_ID,
+        }
+        self._client_secret = jwt.encode(
+            data,
+            self._private_key,
+            algorithm="ES256",
+            headers={"kid": settings.APPLE_KEY_ID},
+        )
+        self._expire_at = timestamp_exp
+
+    async def get(self) -> str:
+        if self._is_fresh():
+            return self._client_secret
+
+        async with self._lock:
+            if not self._is_fresh():
+                await self._refresh()
+
+        return self._client_secret
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            delay = self._expire_at - self.refresh_margin - time.time()
+            # Also paces retries while the key source is failing
+            await asyncio.sleep(max(delay, 30))
+            try:
+                async with self._lock:
+                    await self._refresh()
+            except Exception:
+                logger.exception("Failed to refresh the Apple client secret")
+
+    async def start(self) -> None:
+        try:
+            await self.get()
+        except Exception:
+            # Not fatal at startup, the next login retries on demand
+            logger.exception("Failed to load the Apple client secret")
+
+        self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+
+apple_client_secret_provider = AppleClientSecretProvider(
+    key_source=get_apple_auth_key_source(),
+    validity=settings.APPLE_CLIENT_SECRET_VALIDITY_MINUTES * 60,
+    refresh_margin=settings.APPLE_CLIENT_SECRET_REFRESH_MARGIN_MINUTES * 60,
+)
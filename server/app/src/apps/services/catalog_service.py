@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import SQLModel
+
+from ...core.config import settings
+from ...core.db.redis import get_redis_client
+from ...core.db.session import SessionLocal
+
+from ..models.community_model import Subject, SubjectSub
+from ..models.mood_model import MoodMacroStatus, MoodMicroStatus
+from ..models.role_model import Role
+
+CATALOG_MODELS = (Role, MoodMacroStatus, MoodMicroStatus, Subject, SubjectSub)
+
+
+class CatalogCache:
+    """
+    In-memory copy of the small reference tables (roles, mood statuses and
+    subjects), loaded in the lifespan.
+
+    `version` is a counter kept in Redis; `publish_change` bumps it and
+    announces it on a pub/sub channel so every worker reloads. A periodic
+    reload also picks up rows changed outside the app (migrations, psql).
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self.version = 0
+        self._rows: dict[type[SQLModel], dict[int, dict]] = {}
+        self._listener: asyncio.Task | None = None
+
+    def _generate_version_key(self) -> str:
+        return "catalog:version"
+
+    def _generate_channel(self) -> str:
+        return "catalog:changed"
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._rows)
+
+    async def load(self) -> None:
+        redis_client = await get_redis_client()
+        version = int(await redis_client.get(self._generate_version_key()) or 0)
+
+        rows = {}
+        async with SessionLocal() as db_session:
+            for model in CATALOG_MODELS:
+                # Table rows only: `Role.user` alone would load every user
+                table = model.__table__
+                response = await db_session.execute(
+                    select(table).order_by(*table.primary_key.columns)
+                )
+                rows[model] = {row.id: dict(row._mapping) for row in response}
+
+        self._rows = rows
+        self.version = version
+        logger.info(f"catalog cache loaded, version {version}")
+
+    def _build_detached(self, model: type[SQLModel], columns: dict) -> SQLModel:
+        obj = model(**columns)
+        # Table models drop values they fail to validate (e.g. NULL in a `str` column)
+        for key, value in columns.items():
+            if key not in obj.__dict__:
+                setattr(obj, key, value)
+        make_transient_to_detached(obj)
+        return obj
+
+    def get_all(self, model: type[SQLModel]) -> list[SQLModel]:
+        """
+        Fresh detached objects per call, so callers may attach them to their
+        own session.
+        """
+        return [
+            self._build_detached(model, columns)
+            for columns in self._rows.get(model, {}).values()
+        ]
+
+    def get(self, model: type[SQLModel], id: int) -> SQLModel | None:
+        columns = self._rows.get(model, {}).get(id)
+        if columns is None:
+            return None
+        return self._build_detached(model, columns)
+
+    async def get_role(self, id: int | None) -> Role | None:
+        if id is None:
+            return None
+
+        role = self.get(Role, id)
+        if role is None:
+            # A role created a moment ago on another worker, or no lifespan (scripts)
+            await self.load()
+            role = self.get(Role, id)
+        return role
+
+    async def publish_change(self) -> None:
+        redis_client = await get_redis_client()
+        version = await redis_client.incr(self._generate_version_key())
+        await redis_client.publish(self._generate_channel(), version)
+
+    async def _listen(self) -> None:
+        redis_client = await get_redis_client()
+        loaded_at = time.monotonic()
+        while True:
+            try:
+                async with redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(self._generate_channel())
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        is_stale = time.monotonic() - loaded_at >= self.refresh_seconds
+                        if message is not None and int(message["data"]) != self.version:
+                            is_stale = True
+
+                        if is_stale:
+                            await self.load()
+                            loaded_at = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("catalog cache listener failed, resubscribing")
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        await self.load()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+
+catalog_cache = CatalogCache(refresh_seconds=settings.CATALOG_REFRESH_SECONDS)
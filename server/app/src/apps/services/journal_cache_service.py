@@ -0,0 +1,105 @@
+from collections.abc import Awaitable, Callable
+from datetime import date
+from typing import Any
+
+from fastapi_cache import FastAPICache
+from loguru import logger
+
+from ...core.config import settings
+from ...core.db.redis import (
+    generate_cache_version,
+    get_cache_versions,
+    get_redis_client,
+)
+
+
+class JournalCacheService:
+    """
+    Per-user cache of the calendar reads (`/journal/month` and `/journal`),
+    stored through the FastAPICache backend and coder.
+
+    Each entry's key carries the versions of the months its date range spans.
+    A journal write replaces the version of its month only, so exactly the
+    entries overlapping that month miss from then on; the others keep being
+    served. Versions are random tokens without a TTL, as in `UserCacheService`.
+    """
+
+    def __init__(self, ttl: int, max_months: int):
+        self.ttl = ttl
+        self.max_months = max_months
+
+    def _generate_version_key(self, user_id: int, month: str) -> str:
+        # Outside the FastAPICache prefix: clearing it must not reset versions
+        return f"journal:{user_id}:{month}:cache_version"
+
+    def _generate_data_key(
+        self, user_id: int, kind: str, start: date, end: date, versions: list[str]
+    ) -> str:
+        return (
+            f"{FastAPICache.get_prefix()}:journal:{user_id}:{kind}:"
+            f"{start.isoformat()}:{end.isoformat()}:{'.'.join(versions)}"
+        )
+
+    def _get_months(self, start: date, end: date) -> list[str]:
+        months = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            months.append(f"{year:04d}-{month:02d}")
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
+
+    async def get(
+        self,
+        user_id: int,
+        kind: str,
+        start: date,
+        end: date,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        `start` and `end` are the normalized, inclusive date range the cached
+        value depends on.
+        """
+        months = self._get_months(start, end)
+        if not months or len(months) > self.max_months or not FastAPICache.get_enable():
+            return await loader()
+
+        redis_client = await get_redis_client()
+        versions = await get_cache_versions(
+            redis_client, [self._generate_version_key(user_id, month) for month in months]
+        )
+        data_key = self._generate_data_key(user_id, kind, start, end, versions)
+
+        backend = FastAPICache.get_backend()
+        coder = FastAPICache.get_coder()
+        try:
+            cached = await backend.get(data_key)
+        except Exception:
+            logger.exception(f"could not read journal cache {data_key}")
+            cached = None
+        if cached is not None:
+            return coder.decode(cached)
+
+        value = await loader()
+        try:
+            await backend.set(data_key, coder.encode(value), expire=self.ttl)
+        except Exception:
+            logger.exception(f"could not write journal cache {data_key}")
+        return value
+
+    async def invalidate(self, user_id: int, *days: date | None) -> None:
+        months = {day.strftime("%Y-%m") for day in days if day is not None}
+        if not months:
+            return
+
+        redis_client = await get_redis_client()
+        async with redis_client.pipeline(transaction=True) as pipe:
+            for month in months:
+                pipe.set(self._generate_version_key(user_id, month), generate_cache_version())
+            await pipe.execute()
+
+
+journal_cache_service = JournalCacheService(
+    ttl=settings.JOURNAL_CACHE_TTL_SECONDS,
+    max_months=settings.JOURNAL_CACHE_MAX_MONTHS,
+)
@@ -1,12 +1,12 @@
 from typing import Literal, Callable
-from datetime import datetime
 from urllib import parse
+import asyncio
+import re
 import ssl
+import time
 import certifi
-from jose import jwt
+import inspect
 from jose import jwk
-import boto3
-from botocore.exceptions import ClientError
 
 import aiohttp
 from loguru import logger
@@ -14,6 +14,7 @@ from loguru import logger
 from ...core.config import settings
 from ...core.exceptions.oauth_exceptions import InvalidAuthorizationCode, InvalidToken
 
+from .apple_client_secret import apple_client_secret_provider
 from ..schemas.auth_schema import (
     OAuthToken,
     OAuthTokenBase,
@@ -44,22 +45,65 @@ class OAuthClient:
         self._verify_uri = verify_uri
         self._header_name = "Authorization"
         self._header_type = "Bearer"
+        self._session: aiohttp.ClientSession | None = None
+        self._public_keys: dict[str, dict] = {}
+        self._public_keys_expire_at = 0.0
+        self._public_keys_retry_at = 0.0
+        self._public_keys_lock = asyncio.Lock()
+
+    async def open_session(self) -> None:
+        """
+        Creates the provider's long-lived session, reused by every request so
+        TLS connections and DNS lookups are kept between logins.
+        """
+        if self._session is not None and not self._session.closed:
+            return
 
-    def _get_connector_for_ssl(self) -> aiohttp.TCPConnector:
         ssl_context = ssl.create_default_context(cafile=certifi.where())
-        return aiohttp.TCPConnector(ssl=ssl_context)
+        connector = aiohttp.TCPConnector(
+            ssl=ssl_context,
+            limit=settings.OAUTH_HTTP_POOL_LIMIT,
+            ttl_dns_cache=settings.OAUTH_HTTP_DNS_CACHE_TTL_SECONDS,
+            keepalive_timeout=settings.OAUTH_HTTP_KEEPALIVE_SECONDS,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=settings.OAUTH_HTTP_TIMEOUT_SECONDS,
+                connect=settings.OAUTH_HTTP_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+
+    async def close_session(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get_client_secret(self) -> str:
+        client_secret = self._client_secret_func()
+        if inspect.isawaitable(client_secret):
+            client_secret = await client_secret
+        return client_secret
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Outside the app lifespan (scripts) the session is opened on first use
+        await self.open_session()
+        return self._session
+
+    async def _request_get_with_headers_to(self, url, headers=None):
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as resp:
+            body = None if resp.status != 200 else await resp.json()
+            return body, resp.headers
 
     async def _request_get_to(self, url, headers=None) -> dict | None:
-        conn = self._get_connector_for_ssl()
-        async with aiohttp.ClientSession(connector=conn) as session:
-            async with session.get(url, headers=headers) as resp:
-                return None if resp.status != 200 else await resp.json()
+        body, _ = await self._request_get_with_headers_to(url, headers=headers)
+        return body
 
     async def _request_post_to(self, url, payload=None) -> dict | None:
-        conn = self._get_connector_for_ssl()
-        async with aiohttp.ClientSession(connector=conn) as session:
-            async with session.post(url, data=payload) as resp:
-                return None if resp.status != 200 else await resp.json()
+        session = await self._get_session()
+        async with session.post(url, data=payload) as resp:
+            return None if resp.status != 200 else await resp.json()
 
     def get_oauth_login_url(self, state: str) -> str:
         params = {
@@ -78,7 +122,7 @@ class OAuthClient:
             url=f"{self._authentication_uri}/token",
             payload={
                 "client_id": self._client_id,
-                "client_secret": self._client_secret_func(),
+                "client_secret": await self._get_client_secret(),
                 "grant_type": "authorization_code",
                 "code": code,
                 "state": state,
@@ -95,19 +139,67 @@ class OAuthClient:
 
         return OAuthToken(**tokens)
 
-    async def get_public_key(self):
-        response = await self._request_get_to(url=f"{self._authentication_uri}/keys")
-        public_keys = {
-            key["kid"]: jwk.construct(key).to_dict() for key in response["keys"]
-        }
-        return public_keys
+    def _has_public_key(self, kid: str | None) -> bool:
+        if time.monotonic() >= self._public_keys_expire_at:
+            return False
+        return kid is None or kid in self._public_keys
+
+    def _can_refresh_public_keys(self) -> bool:
+        return time.monotonic() >= self._public_keys_retry_at
+
+    async def get_public_key(self, kid: str | None = None) -> dict[str, dict]:
+        """
+        Returns the provider's public keys by `kid`, cached for the response's
+        `max-age` (or OAUTH_JWKS_CACHE_TTL_SECONDS). An unknown `kid` triggers a
+        refresh, at most once per OAUTH_JWKS_MIN_REFRESH_SECONDS, and concurrent
+        callers wait for the same fetch.
+
+        When the provider can't be reached the previous keys keep being served,
+        and no fetch is tried again for OAUTH_JWKS_RETRY_BACKOFF_SECONDS.
+        """
+        if self._has_public_key(kid) or not self._can_refresh_public_keys():
+            return self._public_keys
+
+        async with self._public_keys_lock:
+            if self._has_public_key(kid) or not self._can_refresh_public_keys():
+                # Refreshed by another caller while waiting, or tried too recently
+                return self._public_keys
+
+            try:
+                response, headers = await self._request_get_with_headers_to(
+                    url=f"{self._authentication_uri}/keys"
+                )
+                if response is None:
+                    logger.warning(f"Failed to fetch {self.provider_name} public keys")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Failed to fetch {self.provider_name} public keys: {e!r}")
+                response = None
+
+            if response is None:
+                # Keep serving the previous keys while the provider is unavailable
+                self._public_keys_retry_at = (
+                    time.monotonic() + settings.OAUTH_JWKS_RETRY_BACKOFF_SECONDS
+                )
+                return self._public_keys
+
+            max_age = re.search(r"max-age=(\d+)", headers.get("Cache-Control", ""))
+            ttl = int(max_age.group(1)) if max_age else settings.OAUTH_JWKS_CACHE_TTL_SECONDS
+
+            self._public_keys = {
+                key["kid"]: jwk.construct(key).to_dict() for key in response["keys"]
+            }
+            fetched_at = time.monotonic()
+            self._public_keys_expire_at = fetched_at + ttl
+            self._public_keys_retry_at = fetched_at + settings.OAUTH_JWKS_MIN_REFRESH_SECONDS
+
+        return self._public_keys
 
     async def refresh_access_token(self, refresh_token: str) -> OAuthTokenBase:
         tokens = await self._request_post_to(
             url=f"{self._authentication_uri}/token",
             payload={
                 "client_id": self._client_id,
-                "client_secret": self._client_secret_func(),
+                "client_secret": await self._get_client_secret(),
                 "grant_type": "refresh_token",
                 "refresh_token": refresh_token,
             },
@@ -159,59 +251,10 @@ kakao_client = OAuthClient(
     verify_uri="https://kapi.kakao.com/v1/user/access_token_info",
 )
 
-def fetch_apple_auth_from_secret_manager():
-
-    secret_name = settings.APPLE_AUTH_KEY
-
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=settings.AWS_DEFAULT_REGION
-    )
-
-    try:
-        get_secret_value_response = client.get_secret_value(
-            SecretId=secret_name
-        )
-    except ClientError as e:
-        raise e
-
-    # Decrypts secret using the associated KMS key.
-    secret = get_secret_value_response['SecretString']
-
-    return secret
-
-def get_apple_client_secret_id():
-    logger.info('get_apple_client_secret_id')
-    private_key = fetch_apple_auth_from_secret_manager()
-
-    validity_minutes = 20
-    timestamp_now = int(datetime.now().timestamp())
-    timestamp_exp = timestamp_now + (60 * validity_minutes)
-
-    data = {
-        "iss": settings.APPLE_TEAM_ID,
-        "iat": timestamp_now,
-        "exp": timestamp_exp,
-        "aud": "https://appleid.apple.com",
-        "sub": settings.APPLE_CLIENT_ID,
-    }
-    token = jwt.encode(
-        data,
-        private_key,
-        algorithm="ES256",
-        headers={"kid": settings.APPLE_KEY_ID},
-    )
-
-    
-    return token
-
-
 apple_client = OAuthClient(
     provider_name="apple",
     client_id=settings.APPLE_CLIENT_ID,
-    client_secret_func=get_apple_client_secret_id,
+    client_secret_func=apple_client_secret_provider.get,
     redirect_uri=settings.APPLE_REDIRECT_URI,
     authentication_uri="https://appleid.apple.com/auth",
     resource_uri="",
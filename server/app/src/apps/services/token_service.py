@@ -1,17 +1,48 @@
-from datetime import timedelta
+from typing import NamedTuple
 from fastapi import Depends
 
 from redis.asyncio import Redis
 
+from ...core.config import settings
 from ...core.db.redis import get_redis_client
 from ...core.schemas.common_schema import TokenType
 
 from ..models.user_model import User
 
 
+# KEYS: token set keys, ARGV: only-registered and replace flags followed by
+# (token, ttl) pairs. With replace, the previous sets are dropped in the same
+# atomic step, so there is no moment without valid tokens. The TTL is set in
+# the same atomic step as the first SADD of a set.
+ISSUE_TOKENS_SCRIPT = """
+local only_registered = ARGV[1] == "1"
+if ARGV[2] == "1" then
+    redis.call("DEL", unpack(KEYS))
+    only_registered = false
+end
+for i, key in ipairs(KEYS) do
+    if not only_registered or redis.call("EXISTS", key) == 1 then
+        redis.call("SADD", key, ARGV[i * 2 + 1])
+        if redis.call("TTL", key) < 0 then
+            redis.call("EXPIRE", key, ARGV[i * 2 + 2])
+        end
+    end
+end
+return 1
+"""
+
+
+class TokenEntry(NamedTuple):
+    token: str
+    token_type: TokenType
+    expire_time: int | None = None
+    provider_name: str | None = None
+
+
 class TokenStorageService:
     def __init__(self, redis_client: Redis):
         self.redis_client = redis_client
+        self._issue_tokens_script = redis_client.register_script(ISSUE_TOKENS_SCRIPT)
 
     def _generate_token_key(
         self, user_id: int, token_type: TokenType, provider_name: str | None = None
@@ -27,6 +58,66 @@ class TokenStorageService:
         valid_tokens = await self.redis_client.smembers(token_key)
         return valid_tokens
 
+    async def is_valid_token(
+        self,
+        user_id: int,
+        token: str,
+        token_type: TokenType,
+        provider_name: str | None = None,
+    ) -> bool:
+        """
+        A token is valid while the user has no registered tokens of that type,
+        or when it is one of them. Checked in one round trip without pulling
+        the whole set.
+        """
+        token_key = self._generate_token_key(user_id, token_type, provider_name)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.exists(token_key)
+            pipe.sismember(token_key, token)
+            has_tokens, is_member = await pipe.execute()
+        return not has_tokens or bool(is_member)
+
+    async def issue_tokens(
+        self,
+        user: User,
+        entries: list[TokenEntry],
+        only_registered: bool = True,
+        replace: bool = False,
+    ):
+        """
+        Adds every token to its set in a single atomic script call.
+        With `only_registered`, sets that do not exist yet are left untouched.
+        With `replace`, the tokens replace every token of their sets, e.g. to
+        sign out all other sessions.
+        """
+        default_expire_minutes = {
+            TokenType.ACCESS: settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+            TokenType.REFRESH: settings.REFRESH_TOKEN_EXPIRE_MINUTES,
+        }
+
+        keys = []
+        args = ["1" if only_registered else "0", "1" if replace else "0"]
+        for entry in entries:
+            keys.append(
+                self._generate_token_key(user.id, entry.token_type, entry.provider_name)
+            )
+            expire_time = entry.expire_time or default_expire_minutes[entry.token_type]
+            args.extend([entry.token, expire_time * 60])
+
+        await self._issue_tokens_script(keys=keys, args=args)
+
+    async def revoke_tokens(
+        self,
+        user: User,
+        token_types: list[TokenType],
+        provider_name: str | None = None,
+    ):
+        token_keys = [
+            self._generate_token_key(user.id, token_type, provider_name)
+            for token_type in token_types
+        ]
+        await self.redis_client.delete(*token_keys)
+
     async def add_token_to_redis(
         self,
         user: User,
@@ -35,11 +126,11 @@ class TokenStorageService:
         expire_time: int | None = None,
         provider_name: str | None = None,
     ):
-        token_key = self._generate_token_key(user.id, token_type, provider_name)
-        valid_tokens = await self.get_valid_tokens(user.id, token_type, provider_name)
-        await self.redis_client.sadd(token_key, token)
-        if not valid_tokens:
-            await self.redis_client.expire(token_key, timedelta(minutes=expire_time))
+        await self.issue_tokens(
+            user,
+            [TokenEntry(token, token_type, expire_time, provider_name)],
+            only_registered=False,
+        )
 
     async def add_valid_token_to_redis(
         self,
@@ -49,19 +140,14 @@ class TokenStorageService:
         expire_time: int | None = None,
         provider_name: str | None = None,
     ):
-        valid_tokens = await self.get_valid_tokens(user.id, token_type, provider_name)
-        if valid_tokens:
-            await self.add_token_to_redis(
-                user, token, token_type, expire_time, provider_name
-            )
+        await self.issue_tokens(
+            user, [TokenEntry(token, token_type, expire_time, provider_name)]
+        )
 
     async def delete_tokens(
         self, user: User, token_type: TokenType, provider_name: str | None = None
     ):
-        token_key = self._generate_token_key(user.id, token_type, provider_name)
-        valid_tokens = await self.redis_client.smembers(token_key)
-        if valid_tokens is not None:
-            await self.redis_client.delete(token_key)
+        await self.revoke_tokens(user, [token_type], provider_name)
 
 
 def get_token_storage_service(
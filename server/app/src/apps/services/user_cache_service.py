@@ -0,0 +1,115 @@
+import json
+from collections.abc import Awaitable, Callable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ...core.config import settings
+from ...core.db.redis import (
+    generate_cache_version,
+    get_cache_versions,
+    get_redis_client,
+)
+from ...core.utils.lru_cache import LRUCache
+
+from ..models.user_model import User
+from .catalog_service import catalog_cache
+
+
+class UserCacheService:
+    """
+    Two-tier cache for the authenticated `User` row; its role comes from the
+    catalog cache.
+
+    L1 is a per-worker LRU, L2 is Redis. Entries of both tiers are tagged with a
+    per-user version kept in Redis; `invalidate` replaces it, so every worker
+    misses on its next lookup and a write is visible from the following request
+    on. Versions are random tokens without a TTL: a version that came back after
+    its key expired would make stale L1 entries of other workers current again.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.ttl = ttl
+        self._local: LRUCache[tuple[str, dict]] = LRUCache(
+            max_size=max_size, ttl=ttl
+        )
+
+    def _generate_version_key(self, user_id: int) -> str:
+        return f"user:{user_id}:cache_version"
+
+    def _generate_data_key(self, user_id: int) -> str:
+        return f"user:{user_id}:cache"
+
+    def _take_snapshot(self, user: User) -> dict:
+        return {"user": {c.key: getattr(user, c.key) for c in User.__table__.columns}}
+
+    def _build_user(self, snapshot: dict) -> User:
+        """
+        Rebuilds a detached `User` per request, so it can still be passed to
+        repository writes (`session.add` attaches it without an INSERT).
+        """
+        columns = snapshot["user"]
+        user = User(**columns)
+        # Table models drop values they fail to validate (e.g. NULL in a `str` column)
+        for key, value in columns.items():
+            if key not in user.__dict__:
+                setattr(user, key, value)
+        make_transient_to_detached(user)
+        return user
+
+    async def _attach_role(self, user: User) -> User:
+        set_committed_value(user, "role", await catalog_cache.get_role(user.role_id))
+        return user
+
+    async def get(
+        self, user_id: int, loader: Callable[[], Awaitable[User | None]]
+    ) -> User | None:
+        redis_client = await get_redis_client()
+        version, data = await redis_client.mget(
+            self._generate_version_key(user_id), self._generate_data_key(user_id)
+        )
+        if version is None:
+            (version,) = await get_cache_versions(
+                redis_client, [self._generate_version_key(user_id)]
+            )
+
+        local = self._local.get(user_id)
+        if local is not None and local[0] == version:
+            return await self._attach_role(self._build_user(local[1]))
+
+        if data is not None:
+            shared = json.loads(data)
+            if shared["version"] == version:
+                user = self._build_user(shared["snapshot"])
+                self._local.set(user_id, (version, self._take_snapshot(user)))
+                return await self._attach_role(user)
+
+        user = await loader()
+        if user is None:
+            return None
+
+        snapshot = self._take_snapshot(user)
+        await redis_client.set(
+            self._generate_data_key(user_id),
+            json.dumps({"version": version, "snapshot": jsonable_encoder(snapshot)}),
+            ex=self.ttl,
+        )
+        self._local.set(user_id, (version, snapshot))
+        return await self._attach_role(user)
+
+    async def invalidate(self, *user_ids: int) -> None:
+        for user_id in user_ids:
+            self._local.pop(user_id)
+
+        redis_client = await get_redis_client()
+        async with redis_client.pipeline(transaction=True) as pipe:
+            for user_id in user_ids:
+                pipe.set(self._generate_version_key(user_id), generate_cache_version())
+                pipe.delete(self._generate_data_key(user_id))
+            await pipe.execute()
+
+
+user_cache_service = UserCacheService(
+    max_size=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
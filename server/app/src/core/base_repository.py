@@ -1,22 +1,49 @@
 from fastapi import HTTPException
 from typing import Any, Generic, TypeVar
+import hashlib
 from uuid import UUID
 
 from loguru import logger
 
-from pydantic import BaseModel
+from pydantic import BaseModel, parse_obj_as
 from fastapi_pagination.ext.async_sqlalchemy import paginate
+from fastapi_pagination.ext.sqlalchemy import count_query
+from fastapi_pagination.ext.utils import unwrap_scalars
 from fastapi_pagination import Params, Page
 from fastapi_async_sqlalchemy import db
 from fastapi import status
 from fastapi_async_sqlalchemy.middleware import DBSessionMeta
-from fastapi.encoders import jsonable_encoder
 from sqlmodel import SQLModel, select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.sql.expression import Select
-from sqlalchemy import exc
+from sqlalchemy import (
+    ARRAY,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    exc,
+    insert,
+    or_,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import MANYTOMANY, ONETOMANY
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.expression import ColumnElement
 
-from .schemas.common_schema import IOrderEnum
+from .config import settings
+from .db.read_routing import get_read_session
+from .db.redis import get_redis_client
+from .db.unit_of_work import commit, get_unit_of_work, savepoint
+from .exceptions.common_exception import BadRequestException
+from .exceptions.http_error import HttpErrorEnum
+from .schemas.common_schema import IOrderEnum, ICountModeEnum
+from .schemas.response_schema import CursorParams, IResponsePage
+from .utils.cursor import encode_cursor, decode_cursor
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -39,11 +66,18 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_db(self) -> DBSessionMeta:
         return self.db
 
+    def get_read_db_session(self) -> AsyncSession:
+        """
+        Session for plain reads: the request's replica session when routing
+        allows it, the primary session otherwise. Writes always use `self.db`.
+        """
+        return get_read_session() or self.db.session
+
     async def get(
         self, *, id: int, db_session: AsyncSession | None = None
     ) -> ModelType | None:
         logger.info(f'get id = {id}')
-        db_session = db_session or self.db.session
+        db_session = db_session or self.get_read_db_session()
         query = select(self.model).where(self.model.id == id)
         response = await db_session.execute(query)
         return response.scalar_one_or_none()
@@ -54,7 +88,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         list_ids: list[UUID | str | int],
         db_session: AsyncSession | None = None,
     ) -> list[ModelType] | None:
-        db_session = db_session or self.db.session
+        db_session = db_session or self.get_read_db_session()
         response = await db_session.execute(
             select(self.model).where(self.model.id.in_(list_ids))
         )
@@ -70,7 +104,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         query = select(self.model).where(self.model.user_id == user_id)
 
         if pagination is False:
-            db_session = db_session or self.db.session
+            db_session = db_session or self.get_read_db_session()
             response = await db_session.execute(query)
             return response.scalar_one_or_none()
         
@@ -79,12 +113,87 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def get_count(
         self, db_session: AsyncSession | None = None
     ) -> ModelType | None:
-        db_session = db_session or self.db.session
+        db_session = db_session or self.get_read_db_session()
         response = await db_session.execute(
-            select(func.count()).select_from(select(self.model).subquery())
+            select(func.count()).select_from(self.model)
         )
         return response.scalar_one()
 
+    async def _count_exact(self, query: Select, db_session: AsyncSession) -> int:
+        response = await db_session.execute(count_query(query.order_by(None)))
+        return response.scalar_one()
+
+    async def _count_cached(self, query: Select, db_session: AsyncSession) -> int:
+        compiled = query.compile()
+        digest = hashlib.sha1(
+            f"{compiled}:{sorted(compiled.params.items())}".encode()
+        ).hexdigest()
+        key = f"count:{self.model.__tablename__}:{digest}"
+
+        redis_client = await get_redis_client()
+        total = await redis_client.get(key)
+        if total is not None:
+            return int(total)
+
+        total = await self._count_exact(query, db_session)
+        await redis_client.set(
+            key, total, ex=settings.PAGINATION_COUNT_CACHE_TTL_SECONDS
+        )
+        return total
+
+    async def _count_estimate(self, db_session: AsyncSession) -> int | None:
+        response = await db_session.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(quote_ident(:table_name))"
+            ),
+            {"table_name": self.model.__tablename__},
+        )
+        estimate = response.scalar_one_or_none()
+        # -1 until the table has been vacuumed or analyzed once
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
+
+    async def _paginate(
+        self,
+        *,
+        query: Select,
+        params: Params,
+        count_mode: ICountModeEnum,
+        is_filtered: bool,
+        db_session: AsyncSession,
+    ) -> IResponsePage[ModelType]:
+        if count_mode == ICountModeEnum.exact:
+            return await paginate(db_session, query, params)
+
+        # The table estimate says nothing about a filtered query
+        if count_mode == ICountModeEnum.estimate and is_filtered:
+            count_mode = ICountModeEnum.cached
+
+        total = None
+        if count_mode == ICountModeEnum.estimate:
+            total = await self._count_estimate(db_session)
+            if total is None:
+                count_mode = ICountModeEnum.cached
+        if count_mode == ICountModeEnum.cached:
+            total = await self._count_cached(query, db_session)
+
+        # One extra row tells whether there is a next page, whatever the total says
+        response = await db_session.execute(
+            query.limit(params.size + 1).offset(params.size * (params.page - 1))
+        )
+        items = unwrap_scalars(response.unique().all())
+        has_next = len(items) > params.size
+
+        return IResponsePage.create(
+            items[: params.size],
+            params=params,
+            total=total,
+            total_mode=count_mode,
+            has_next=has_next,
+        )
+
     async def get_multi(
         self,
         *,
@@ -93,7 +202,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         query: T | Select[T] | None = None,
         db_session: AsyncSession | None = None,
     ) -> list[ModelType]:
-        db_session = db_session or self.db.session
+        db_session = db_session or self.get_read_db_session()
         if query is None:
             query = select(self.model).offset(skip).limit(limit).order_by(self.model.id)
         response = await db_session.execute(query)
@@ -104,12 +213,24 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         *,
         params: Params | None = Params(),
         query: T | Select[T] | None = None,
+        count_mode: ICountModeEnum = ICountModeEnum.exact,
         db_session: AsyncSession | None = None,
     ) -> Page[ModelType]:
-        db_session = db_session or self.db.session
+        """
+        Offset pagination. `count_mode` picks how the total is produced, see
+        `ICountModeEnum`; `estimate` only applies to unfiltered listings.
+        """
+        db_session = db_session or self.get_read_db_session()
+        is_filtered = query is not None
         if query is None:
             query = select(self.model)
-        return await paginate(db_session, query, params)
+        return await self._paginate(
+            query=query,
+            params=params,
+            count_mode=count_mode,
+            is_filtered=is_filtered,
+            db_session=db_session,
+        )
 
     async def get_multi_paginated_ordered(
         self,
@@ -118,22 +239,124 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         order_by: str | None = None,
         order: IOrderEnum | None = IOrderEnum.ascendent,
         query: T | Select[T] | None = None,
+        count_mode: ICountModeEnum = ICountModeEnum.exact,
         db_session: AsyncSession | None = None,
     ) -> Page[ModelType]:
-        db_session = db_session or self.db.session
+        db_session = db_session or self.get_read_db_session()
 
         columns = self.model.__table__.columns
 
         if order_by is None or order_by not in columns:
             order_by = "id"
 
+        is_filtered = query is not None
         if query is None:
             if order == IOrderEnum.ascendent:
                 query = select(self.model).order_by(columns[order_by].asc())
             else:
                 query = select(self.model).order_by(columns[order_by].desc())
 
-        return await paginate(db_session, query, params)
+        return await self._paginate(
+            query=query,
+            params=params,
+            count_mode=count_mode,
+            is_filtered=is_filtered,
+            db_session=db_session,
+        )
+
+    def _after_keyset(
+        self, keyset: list[ColumnElement], values: list[Any], is_ascendent: bool
+    ) -> ColumnElement:
+        """
+        Rows after the cursor `values`. A row value comparison is used whenever
+        it can be (it is served by an index on the keyset); with a nullable
+        order column the NULLs, sorted last, are handled explicitly.
+        """
+        def after(column, value):
+            return column > value if is_ascendent else column < value
+
+        order_column = keyset[0]
+        if not order_column.nullable:
+            return after(tuple_(*keyset), tuple_(*values))
+
+        value, id = values
+        id_column = keyset[1]
+        if value is None:
+            return and_(order_column.is_(None), after(id_column, id))
+        return or_(
+            after(order_column, value),
+            and_(order_column == value, after(id_column, id)),
+            order_column.is_(None),
+        )
+
+    async def get_multi_cursor_paginated(
+        self,
+        *,
+        params: CursorParams | None = CursorParams(),
+        order_by: str | None = None,
+        order: IOrderEnum | None = IOrderEnum.ascendent,
+        query: T | Select[T] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> IResponsePage[ModelType]:
+        """
+        Keyset pagination over `(order_by, id)`; every page is a range scan
+        starting right after the previous page's last row, however deep it is.
+        **Parameters**
+        * `params`: The opaque `cursor` of the previous page (None for the first) and `size`
+        * `order_by`: A column, ideally non-nullable and indexed together with `id`; NULLs of a nullable one come last in both orders
+        * `query`: Base query to filter; its own ORDER BY is replaced
+        """
+        db_session = db_session or self.get_read_db_session()
+
+        columns = self.model.__table__.columns
+
+        if order_by is None or order_by not in columns:
+            order_by = "id"
+
+        order_column = columns[order_by]
+        id_column = columns["id"]
+        keyset = (
+            [order_column, id_column] if order_by != "id" else [id_column]
+        )
+        is_ascendent = order == IOrderEnum.ascendent
+
+        if query is None:
+            query = select(self.model)
+
+        if params.cursor is not None:
+            try:
+                values = decode_cursor(params.cursor)
+                if len(values) != len(keyset):
+                    raise ValueError("cursor does not match the ordering")
+                values = [
+                    value
+                    if value is None and column.nullable
+                    else parse_obj_as(self.model.__fields__[column.key].outer_type_, value)
+                    for column, value in zip(keyset, values)
+                ]
+            except ValueError:
+                raise BadRequestException(HttpErrorEnum.INVALID_CURSOR, "invalid cursor")
+
+            query = query.where(self._after_keyset(keyset, values, is_ascendent))
+
+        if is_ascendent:
+            ordering = [c.asc() for c in keyset]
+        else:
+            ordering = [c.desc() for c in keyset]
+        if order_column.nullable:
+            ordering[0] = ordering[0].nulls_last()
+        query = query.order_by(None).order_by(*ordering)
+
+        # One extra row tells whether there is a next page, without a COUNT
+        response = await db_session.execute(query.limit(params.size + 1))
+        items = response.scalars().all()
+
+        next_cursor = None
+        if len(items) > params.size:
+            items = items[: params.size]
+            next_cursor = encode_cursor([getattr(items[-1], c.key) for c in keyset])
+
+        return IResponsePage.create_cursor(items, params, next_cursor)
 
     async def get_multi_ordered(
         self,
@@ -144,7 +367,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         order: IOrderEnum | None = IOrderEnum.ascendent,
         db_session: AsyncSession | None = None,
     ) -> list[ModelType]:
-        db_session = db_session or self.db.session
+        db_session = db_session or self.get_read_db_session()
 
         columns = self.model.__table__.columns
 
@@ -174,24 +397,42 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         *,
         obj_in: CreateSchemaType | ModelType,
         created_by_id: UUID | str | int | None = None,
+        load_relationships: list[str] | None = None,
         db_session: AsyncSession | None = None,
     ) -> ModelType:
+        """
+        Inserts the row and reads it back in the same statement (RETURNING).
+        **Parameters**
+        * `load_relationships`: Relationships to load with one more query; RETURNING only brings back columns, so the others are left unloaded
+        """
         db_session = db_session or self.db.session
-        db_obj = self.model.from_orm(obj_in)  # type: ignore
+        row = self._to_row(obj_in)
 
         if created_by_id:
-            db_obj.created_by_id = created_by_id
+            row["created_by_id"] = created_by_id
 
+        stmt = (
+            insert(self.model)
+            .values(**row)
+            .returning(*self.model.__table__.columns)
+        )
         try:
-            db_session.add(db_obj)
-            await db_session.commit()
+            # Inside a unit of work only this statement is undone on conflict
+            async with savepoint(db_session):
+                response = await db_session.execute(
+                    select(self.model).from_statement(stmt)
+                )
+                db_obj = response.scalar_one()
         except exc.IntegrityError:
-            await db_session.rollback()
+            if get_unit_of_work(db_session) is None:
+                await db_session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Resource already exists",
             )
-        await db_session.refresh(db_obj)
+        await commit(db_session)
+        if load_relationships:
+            await db_session.refresh(db_obj, attribute_names=load_relationships)
         return db_obj
 
     async def update(
@@ -202,7 +443,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_session: AsyncSession | None = None,
     ) -> ModelType:
         db_session = db_session or self.db.session
-        obj_data = jsonable_encoder(obj_current)
+        table = self.model.__table__
 
         if isinstance(obj_new, dict):
             update_data = obj_new
@@ -210,31 +451,227 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             update_data = obj_new.dict(
                 exclude_unset=True
             )  # This tells Pydantic to not include the values that were not sent
-        for field in obj_data:
-            if field in update_data:
-                setattr(obj_current, field, update_data[field])
+        values = {
+            field: value for field, value in update_data.items() if field in table.c
+        }
+        if not values:
+            return obj_current
 
-        db_session.add(obj_current)
-        await db_session.commit()
-        await db_session.refresh(obj_current)
+        # Core statement on the table: the returned row is written into
+        # `obj_current` as committed state, its loaded relationships are kept
+        response = await db_session.execute(
+            update(table)
+            .where(table.c.id == obj_current.id)
+            .values(**values)
+            .returning(*table.c)
+        )
+        row = response.mappings().one()
+        await commit(db_session)
+
+        for key, value in row.items():
+            set_committed_value(obj_current, key, value)
+
+        # A changed foreign key makes the related object stale
+        state = sa_inspect(obj_current)
+        stale = [
+            relationship.key
+            for relationship in state.mapper.relationships
+            if relationship.key in state.dict
+            and any(column.key in values for column in relationship.local_columns)
+        ]
+        if stale:
+            db_session.add(obj_current)
+            await db_session.refresh(obj_current, attribute_names=stale)
         return obj_current
 
+    def _has_dependent_collections(self) -> bool:
+        return any(
+            relationship.direction in (ONETOMANY, MANYTOMANY)
+            for relationship in sa_inspect(self.model).relationships
+        )
+
     async def remove(
         self, *, id: UUID | str | int, db_session: AsyncSession | None = None
     ) -> ModelType:
         db_session = db_session or self.db.session
-        response = await db_session.execute(
-            select(self.model).where(self.model.id == id)
+
+        if self._has_dependent_collections():
+            # The ORM has to visit the children (nulling their foreign keys),
+            # which a bare DELETE statement would skip
+            response = await db_session.execute(
+                select(self.model).where(self.model.id == id)
+            )
+            obj = response.scalar_one()
+            await db_session.delete(obj)
+            await commit(db_session)
+            return obj
+
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(*self.model.__table__.columns)
         )
+        response = await db_session.execute(select(self.model).from_statement(stmt))
         obj = response.scalar_one()
-        await db_session.delete(obj)
-        await db_session.commit()
+        db_session.expunge(obj)
+        await commit(db_session)
         return obj
 
+    def _to_row(self, obj_in: CreateSchemaType | ModelType) -> dict[str, Any]:
+        db_obj = self.model.from_orm(obj_in)  # type: ignore
+        return {
+            c.key: getattr(db_obj, c.key)
+            for c in self.model.__table__.columns
+            # Left to the database when not given (serial ids)
+            if not (c.primary_key and getattr(db_obj, c.key) is None)
+        }
+
+    def _bulk_where(
+        self,
+        ids: list[UUID | str | int] | None,
+        where: list[ColumnElement] | None,
+    ) -> list[ColumnElement]:
+        clauses = list(where or [])
+        if ids is not None:
+            # A single array parameter, whatever the number of ids
+            clauses.append(
+                self.model.id
+                == any_(bindparam("ids", list(ids), type_=ARRAY(self.model.id.type)))
+            )
+        if not clauses:
+            raise ValueError("ids or where is required for a bulk statement")
+        return clauses
+
+    async def create_many(
+        self,
+        *,
+        objs_in: list[CreateSchemaType | ModelType],
+        db_session: AsyncSession | None = None,
+    ) -> list[ModelType]:
+        """
+        Inserts all rows with one multi-row `INSERT ... RETURNING`.
+        """
+        if not objs_in:
+            return []
+
+        db_session = db_session or self.db.session
+        stmt = (
+            insert(self.model)
+            .values([self._to_row(obj_in) for obj_in in objs_in])
+            .returning(*self.model.__table__.columns)
+        )
+
+        try:
+            # Inside a unit of work only this statement is undone on conflict
+            async with savepoint(db_session):
+                response = await db_session.execute(
+                    select(self.model).from_statement(stmt)
+                )
+                db_objs = response.scalars().all()
+        except exc.IntegrityError:
+            if get_unit_of_work(db_session) is None:
+                await db_session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Resource already exists",
+            )
+        await commit(db_session)
+        return db_objs
+
+    async def copy_many(
+        self,
+        *,
+        objs_in: list[CreateSchemaType | ModelType],
+        db_session: AsyncSession | None = None,
+    ) -> int:
+        """
+        Loads rows with Postgres `COPY` through asyncpg, for backfills too large
+        for `create_many`. Nothing is returned but the number of rows copied.
+        """
+        if not objs_in:
+            return 0
+
+        db_session = db_session or self.db.session
+        rows = [self._to_row(obj_in) for obj_in in objs_in]
+        # Every column of the table, but serial ids none of the rows gave
+        columns = [
+            c.key
+            for c in self.model.__table__.columns
+            if any(c.key in row for row in rows)
+        ]
+        if any(len(row) != len(columns) for row in rows):
+            raise ValueError("ids have to be given for all rows or for none")
+
+        connection = await db_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.model.__tablename__,
+            records=[tuple(row[c] for c in columns) for row in rows],
+            columns=columns,
+        )
+        await commit(db_session)
+        return len(rows)
+
+    async def update_many(
+        self,
+        *,
+        values: dict[str, Any],
+        ids: list[UUID | str | int] | None = None,
+        where: list[ColumnElement] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> list[ModelType]:
+        """
+        Applies `values` to every row matched by `ids` and/or `where` with one
+        `UPDATE ... RETURNING`; loaded instances are refreshed in place.
+        """
+        db_session = db_session or self.db.session
+        stmt = (
+            update(self.model)
+            .where(*self._bulk_where(ids, where))
+            .values(**values)
+            .returning(*self.model.__table__.columns)
+        )
+        response = await db_session.execute(
+            select(self.model)
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        db_objs = response.scalars().all()
+        await commit(db_session)
+        return db_objs
+
+    async def delete_many(
+        self,
+        *,
+        ids: list[UUID | str | int] | None = None,
+        where: list[ColumnElement] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> list[UUID | str | int]:
+        """
+        Deletes every row matched by `ids` and/or `where` with one statement and
+        returns the deleted ids; loaded instances are removed from the session.
+        """
+        db_session = db_session or self.db.session
+        response = await db_session.execute(
+            delete(self.model)
+            .where(*self._bulk_where(ids, where))
+            .returning(self.model.id)
+            # The in-Python evaluation of the criteria can't handle `any_()`;
+            # RETURNING already tells which instances are gone
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = response.scalars().all()
+        for id in deleted_ids:
+            obj = db_session.identity_map.get(identity_key(self.model, id))
+            if obj is not None:
+                db_session.expunge(obj)
+        await commit(db_session)
+        return deleted_ids
+
     async def get_count_with_user_id(
         self, *, where_value: int, db_session: AsyncSession | None = None
     ) -> ModelType | None:
-        db_session = db_session or self.db.session
+        db_session = db_session or self.get_read_db_session()
         
         response = await db_session.execute(
             select(func.count()).select_from(self.model).where(self.model.user_id == where_value)
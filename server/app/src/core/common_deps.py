@@ -4,11 +4,11 @@ from collections.abc import AsyncGenerator
 from jose import jwt, ExpiredSignatureError
 
 from pydantic import ValidationError
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .utils.auth import security
-from .config import settings
+from .utils.auth.token_claims import get_verified_claims
+from .db.read_routing import track_user
 from .db.session import SessionLocal
 from .schemas.common_schema import TokenType
 
@@ -29,14 +29,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 def get_current_user(required_roles: list[str] = None) -> User:
     async def current_user(
+        request: Request,
         user_repository: UserRepository = Depends(get_user_repository),
         access_token: str = Depends(obtain_authorization_token),
         token_service: TokenStorageService = Depends(get_token_storage_service),
     ) -> User:
         try:
-            payload = jwt.decode(
-                access_token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-            )
+            payload = get_verified_claims(request, access_token)
         except ExpiredSignatureError:
             raise UnauthorizedException(HttpErrorEnum.ACCESS_EXPIRED, "access token is expired")
         except (jwt.JWTError, ValidationError):
@@ -49,15 +48,16 @@ def get_current_user(required_roles: list[str] = None) -> User:
                 status_code=status.HTTP_403_FORBIDDEN, detail="Invalid user type/syntax"
             )
 
-        valid_access_tokens = await token_service.get_valid_tokens(
-            user_id, TokenType.ACCESS
+        is_valid_access_token = await token_service.is_valid_token(
+            user_id, access_token, TokenType.ACCESS
         )
-        if valid_access_tokens and access_token not in valid_access_tokens:
+        if not is_valid_access_token:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Could not validate credentials",
             )
-        user: User = await user_repository.get(id=user_id)
+        await track_user(user_id)
+        user: User = await user_repository.get_with_cache(id=user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
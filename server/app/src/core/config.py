@@ -20,6 +20,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ENCRYPT_KEY = secrets.token_urlsafe(32)
 
+    TOKEN_CLAIMS_CACHE_SIZE: int = 10000
+
     """Database"""
     DATABASE_HOST: str
     DATABASE_USER: str
@@ -42,13 +44,48 @@ class Settings(BaseSettings):
             path=f"/{values.get('DATABASE_NAME') or ''}",
         )
 
-    DB_POOL_SIZE = 83
-    WEB_CONCURRENCY = 9
-    POOL_SIZE = max(DB_POOL_SIZE // WEB_CONCURRENCY, 5)
+    # Optional read-only replica (postgresql+asyncpg://...), GET reads go there when set
+    READ_REPLICA_DATABASE_URI: str | None = None
+    # How long a user's reads stay on the primary after one of their writes
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Connections this app may open on the database server, all workers together
+    DB_MAX_CONNECTIONS: int = 83
+    # Left free for migrations, scripts and manual sessions
+    DB_RESERVED_CONNECTIONS: int = 5
+    # Worker processes per instance, the same variable uvicorn/gunicorn read
+    WEB_CONCURRENCY: int = 1
+    DB_POOL_TIMEOUT_SECONDS: float = 10
+
+    # Share of requests whose statements are counted and timed (0 turns it off)
+    QUERY_STATS_SAMPLE_RATE: float = 1.0
+    # Outside production, warn when one request runs a statement this many times
+    QUERY_REPEAT_THRESHOLD: int = 5
+    # Statements slower than this are kept for /monitor/slow-queries (0 turns it off)
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SLOW_QUERY_LOG_SIZE: int = 100
+    SLOW_QUERY_EXPLAIN: bool = True
+    # EXPLAINs running at once per worker, each on its own connection taken
+    # from DB_RESERVED_CONNECTIONS
+    SLOW_QUERY_EXPLAIN_CONCURRENCY: int = 1
 
     """Redis"""
     REDIS_HOST: str
     REDIS_PORT: str
+    REDIS_MAX_CONNECTIONS: int = 20
+    REDIS_POOL_TIMEOUT_SECONDS: float = 5
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 5
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = 2
+
+    """Cache"""
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 300
+    PAGINATION_COUNT_CACHE_TTL_SECONDS: int = 30
+    JOURNAL_CACHE_TTL_SECONDS: int = 3600
+    # Wider date ranges are read from the database without caching
+    JOURNAL_CACHE_MAX_MONTHS: int = 12
+    # Safety reload of the reference tables, on top of the change notifications
+    CATALOG_REFRESH_SECONDS: int = 300
 
     """Initial"""
     FIRST_SUPERUSER_EMAIL: EmailStr
@@ -74,6 +111,22 @@ class Settings(BaseSettings):
     APPLE_REDIRECT_URI: str
     APPLE_TEAM_ID: str
     APPLE_KEY_ID: str
+    # Where the Apple private key comes from: "secrets_manager", "file" or "env"
+    APPLE_AUTH_KEY_SOURCE: str = "secrets_manager"
+    APPLE_AUTH_KEY_PATH: str | None = None
+    APPLE_AUTH_PRIVATE_KEY: str | None = None
+    APPLE_CLIENT_SECRET_VALIDITY_MINUTES: int = 20
+    APPLE_CLIENT_SECRET_REFRESH_MARGIN_MINUTES: int = 5
+
+    OAUTH_HTTP_TIMEOUT_SECONDS: float = 10
+    OAUTH_HTTP_CONNECT_TIMEOUT_SECONDS: float = 3
+    OAUTH_HTTP_POOL_LIMIT: int = 100
+    OAUTH_HTTP_KEEPALIVE_SECONDS: float = 30
+    OAUTH_HTTP_DNS_CACHE_TTL_SECONDS: int = 300
+    OAUTH_JWKS_CACHE_TTL_SECONDS: int = 3600
+    OAUTH_JWKS_MIN_REFRESH_SECONDS: int = 60
+    # Wait after a failed key fetch before the provider is tried again
+    OAUTH_JWKS_RETRY_BACKOFF_SECONDS: int = 10
 
     """AWS"""
     AWS_DEFAULT_REGION: str
@@ -0,0 +1,110 @@
+import random
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi import Request
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from ..config import settings
+from ..constants.constant import PRODUCTION
+
+
+class QueryStats:
+    """
+    SQL statements issued while serving one request. `statements` is only
+    kept when repeated statements (N+1) are being detected.
+    """
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self, detect_repeats: bool):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] | None = Counter() if detect_repeats else None
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _query_stats.get() is None:
+        return
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    if stats is None:
+        return
+
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    stats.count += 1
+    stats.duration += time.perf_counter() - started.pop()
+    if stats.statements is not None:
+        stats.statements[statement] += 1
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches `_after_cursor_execute`
+    if _query_stats.get() is None or exception_context.execution_context is None:
+        return
+    started = exception_context.connection.info.get("query_started_at")
+    if started:
+        started.pop()
+
+
+def install_query_stats(engines: list[AsyncEngine]) -> None:
+    """
+    Hooks the statement timing into the engines. The hooks return right away
+    for requests that are not sampled.
+    """
+    for engine in engines:
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Reports the statement count and DB time of a sampled request in a
+    `Server-Timing` header and a log line, and warns about statements repeated
+    `QUERY_REPEAT_THRESHOLD` times outside production.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+        if random.random() >= settings.QUERY_STATS_SAMPLE_RATE:
+            return await call_next(request)
+
+        detect_repeats = (
+            settings.APP_ENV != PRODUCTION and settings.QUERY_REPEAT_THRESHOLD > 0
+        )
+        stats = QueryStats(detect_repeats)
+        token = _query_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            _query_stats.reset(token)
+
+        db_ms = stats.duration * 1000
+        response.headers.append(
+            "Server-Timing", f'db;dur={db_ms:.1f};desc="{stats.count} queries"'
+        )
+        logger.info(
+            f"db stats: method={request.method} path={request.url.path} "
+            f"status={response.status_code} queries={stats.count} db_ms={db_ms:.1f}"
+        )
+
+        if stats.statements is not None:
+            for statement, count in stats.statements.items():
+                if count >= settings.QUERY_REPEAT_THRESHOLD:
+                    logger.warning(
+                        f"possible N+1: {request.method} {request.url.path} ran "
+                        f"the same statement {count} times: {statement[:200]}"
+                    )
+        return response
@@ -0,0 +1,106 @@
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from ..config import settings
+from .redis import get_redis_client
+from .session import ReadSessionLocal
+
+READ_METHODS = ("GET", "HEAD")
+
+
+class ReadRouting:
+    """
+    Per-request routing state. The middleware creates it before the endpoint
+    runs and closes the replica session (if any was opened) afterwards.
+    """
+
+    __slots__ = ("use_replica", "user_id", "has_writes", "session")
+
+    def __init__(self, use_replica: bool):
+        self.use_replica = use_replica
+        self.user_id: int | None = None
+        self.has_writes = False
+        self.session: AsyncSession | None = None
+
+
+_routing: ContextVar[ReadRouting | None] = ContextVar("read_routing", default=None)
+
+
+def _generate_pin_key(user_id: int) -> str:
+    return f"user:{user_id}:read_primary"
+
+
+def get_read_session() -> AsyncSession | None:
+    """
+    Replica session of the current request, or None when reads have to go to
+    the primary (no replica configured, not a GET, or a recent own write,
+    including one earlier in this request).
+    """
+    routing = _routing.get()
+    if routing is None or not routing.use_replica:
+        return None
+
+    if routing.session is None:
+        routing.session = ReadSessionLocal()
+    return routing.session
+
+
+async def track_user(user_id: int) -> None:
+    """
+    Called once the request's user is known: keeps their reads on the primary
+    while their own last write may not have reached the replica yet.
+    """
+    routing = _routing.get()
+    if routing is None:
+        return
+
+    routing.user_id = user_id
+    if routing.use_replica:
+        redis_client = await get_redis_client()
+        if await redis_client.exists(_generate_pin_key(user_id)):
+            routing.use_replica = False
+
+
+def mark_write() -> None:
+    """
+    Called on every write of the request, whatever its method: the rest of the
+    request reads from the primary, and its user is pinned there afterwards.
+    """
+    routing = _routing.get()
+    if routing is None:
+        return
+
+    routing.has_writes = True
+    routing.use_replica = False
+
+
+class ReadReplicaMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+        if ReadSessionLocal is None:
+            return await call_next(request)
+
+        routing = ReadRouting(use_replica=request.method in READ_METHODS)
+        token = _routing.set(routing)
+        try:
+            response = await call_next(request)
+        finally:
+            _routing.reset(token)
+            if routing.session is not None:
+                await routing.session.close()
+
+        # Failed requests are rolled back by the unit of work
+        if (
+            routing.has_writes
+            and routing.user_id is not None
+            and response.status_code < 400
+        ):
+            redis_client = await get_redis_client()
+            await redis_client.set(
+                _generate_pin_key(routing.user_id),
+                1,
+                ex=settings.READ_YOUR_WRITES_SECONDS,
+            )
+        return response
@@ -1,14 +1,118 @@
-import redis.asyncio as aioredis
-from redis.asyncio import Redis
+import time
+import uuid
+
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from ..config import settings
 
 
-async def get_redis_client() -> Redis:
-    redis = await aioredis.from_url(
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Blocking pool that keeps usage counters, including how often and how long
+    callers had to wait for a free connection.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Connections handed out; the base class also releases the ones whose
+        # connect failed, which were never counted
+        self._acquired: set[int] = set()
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    @property
+    def in_use(self) -> int:
+        return len(self._acquired)
+
+    async def get_connection(self, *args, **kwargs):
+        # Only an empty queue makes the caller wait for a released connection
+        must_wait = self.pool.empty()
+        started_at = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        finally:
+            # Waits that timed out count too
+            if must_wait:
+                waited = time.perf_counter() - started_at
+                self.wait_count += 1
+                self.wait_time_total += waited
+                self.wait_time_max = max(self.wait_time_max, waited)
+
+        self._acquired.add(id(connection))
+        return connection
+
+    async def release(self, connection):
+        self._acquired.discard(id(connection))
+        await super().release(connection)
+
+    def get_stats(self) -> dict:
+        created = len(self._connections)
+        return {
+            "max_connections": self.max_connections,
+            "created": created,
+            "in_use": self.in_use,
+            "idle": max(created - self.in_use, 0),
+            "wait_count": self.wait_count,
+            "wait_time_total": self.wait_time_total,
+            "wait_time_max": self.wait_time_max,
+        }
+
+
+redis_client: Redis | None = None
+
+
+def init_redis_client() -> Redis:
+    """
+    Creates the worker-wide client and its pool; called once from the lifespan.
+    """
+    global redis_client
+    pool = InstrumentedConnectionPool.from_url(
         f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-        max_connections=10,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
         encoding="utf8",
         decode_responses=True,
     )
-    return redis
+    redis_client = Redis(connection_pool=pool)
+    return redis_client
+
+
+async def close_redis_client() -> None:
+    global redis_client
+    if redis_client is None:
+        return
+
+    await redis_client.close(close_connection_pool=True)
+    redis_client = None
+
+
+async def get_redis_client() -> Redis:
+    # Scripts run without the lifespan, so the client is created on first use there
+    return redis_client or init_redis_client()
+
+
+def generate_cache_version() -> str:
+    # Never reused, unlike a counter that starts over at 1 once its key is gone
+    return uuid.uuid4().hex
+
+
+async def get_cache_versions(redis_client: Redis, keys: list[str]) -> list[str]:
+    """
+    Current versions of the cache version `keys`. Keys that are missing (never
+    bumped, or evicted) get a fresh version rather than a default, so entries
+    tagged before a key was lost can never match again.
+    """
+    versions = await redis_client.mget(keys)
+    if all(version is not None for version in versions):
+        return versions
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key, version in zip(keys, versions):
+            if version is None:
+                pipe.set(key, generate_cache_version(), nx=True)
+        pipe.mget(keys)
+        *_, versions = await pipe.execute()
+    return versions
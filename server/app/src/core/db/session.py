@@ -1,24 +1,98 @@
+import time
+
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..config import settings
+from ..constants.constant import PRODUCTION
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that also records how long checkouts take, i.e. how long
+    requests wait for a free connection once the pool is exhausted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        connection = super()._do_get()
+        waited = time.perf_counter() - started_at
+
+        self.wait_count += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+        return connection
+
+    def get_stats(self) -> dict:
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "wait_count": self.wait_count,
+            "wait_time_total": self.wait_time_total,
+            "wait_time_max": self.wait_time_max,
+        }
+
+
+def get_pool_limits() -> tuple[int, int]:
+    """
+    Splits the app's connection budget on the database between the worker
+    processes, so `workers * (pool_size + max_overflow)` never exceeds it.
+    """
+    available = settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS
+    per_worker = max(available // max(settings.WEB_CONCURRENCY, 1), 1)
+    max_overflow = per_worker // 4
+    return per_worker - max_overflow, max_overflow
+
+
+def create_engine(url: str) -> AsyncEngine:
+    pool_size, max_overflow = get_pool_limits()
+    return create_async_engine(
+        url,
+        echo=settings.APP_ENV != PRODUCTION,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+
+
+def create_sessionmaker(bind: AsyncEngine) -> sessionmaker:
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
 
+# The only engines of a process: the request middleware, `get_db` and the
+# scripts all share them
+engine = create_engine(settings.ASYNC_DATABASE_URI)
+SessionLocal = create_sessionmaker(engine)
 
-connect_args = {"check_same_thread": False}
+read_engine = None
+ReadSessionLocal = None
+if settings.READ_REPLICA_DATABASE_URI:
+    read_engine = create_engine(settings.READ_REPLICA_DATABASE_URI)
+    ReadSessionLocal = create_sessionmaker(read_engine)
 
-engine = create_async_engine(
-    settings.ASYNC_DATABASE_URI,
-    # echo=True,
-    future=True,
-    pool_size=settings.POOL_SIZE,
-    max_overflow=64,
-)
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+def get_engines() -> dict[str, AsyncEngine]:
+    engines = {"primary": engine}
+    if read_engine is not None:
+        engines["replica"] = read_engine
+    return engines
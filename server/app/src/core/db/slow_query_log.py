@@ -0,0 +1,173 @@
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+import greenlet
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from ..config import settings
+
+EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+REPOSITORY_DIR = f"{os.sep}repositories{os.sep}"
+REPOSITORY_BASE_FILE = f"{os.sep}base_repository.py"
+
+_slow_queries: deque[dict] = deque(maxlen=settings.SLOW_QUERY_LOG_SIZE)
+_pending_explains: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def get_slow_queries() -> list[dict]:
+    """
+    Slow statements of this worker, most recent first.
+    """
+    return list(reversed(_slow_queries))
+
+
+def _redact(value):
+    if value is None:
+        return None
+    return f"<{type(value).__name__}>"
+
+
+def _redact_parameters(parameters, executemany: bool):
+    # Only the shape of the binds is kept, never the values
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    if isinstance(parameters, dict):
+        return {key: _redact(value) for key, value in parameters.items()}
+    return [_redact(value) for value in parameters or ()]
+
+
+def _iter_frames():
+    frame = sys._getframe(1)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+    # The ORM runs the statement in a greenlet; the awaiting coroutines (and
+    # with them the repository) are on the stack of its parent
+    parent = greenlet.getcurrent().parent
+    frame = parent.gr_frame if parent is not None else None
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def _find_caller() -> str | None:
+    """
+    Outermost repository method on the stack, i.e. the one the route called.
+    """
+    caller = None
+    for frame in _iter_frames():
+        filename = frame.f_code.co_filename
+        if REPOSITORY_DIR not in filename and not filename.endswith(REPOSITORY_BASE_FILE):
+            continue
+
+        owner = frame.f_locals.get("self")
+        name = frame.f_code.co_name
+        caller = f"{type(owner).__name__}.{name}" if owner is not None else name
+    return caller
+
+
+async def _explain(engine: AsyncEngine, entry: dict, statement: str, parameters) -> None:
+    try:
+        # `engine` has no pool: a slow query often means the app's pool is
+        # under pressure, its connections are left to the requests
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            entry["plan"] = result.scalar()
+    except Exception as e:
+        logger.warning(f"could not explain slow query: {e}")
+    finally:
+        _pending_explains.discard(statement)
+
+
+def _schedule_explain(engine: AsyncEngine, entry: dict, statement: str, parameters) -> None:
+    if not settings.SLOW_QUERY_EXPLAIN or statement in _pending_explains:
+        return
+    if len(_pending_explains) >= settings.SLOW_QUERY_EXPLAIN_CONCURRENCY:
+        # Skipped rather than queued: slow queries tend to come in bursts
+        return
+    if not statement.lstrip().upper().startswith(EXPLAINABLE_PREFIXES):
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    _pending_explains.add(statement)
+    task = loop.create_task(_explain(engine, entry, statement, parameters))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started_at", []).append(time.perf_counter())
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches `after_cursor_execute`; its start time
+    # would be paired with the next statement's end otherwise
+    if exception_context.execution_context is None or exception_context.connection is None:
+        return
+    started = exception_context.connection.info.get("slow_query_started_at")
+    if started:
+        started.pop()
+
+
+def install_slow_query_log(engines: dict[str, AsyncEngine]) -> None:
+    """
+    Records statements slower than `SLOW_QUERY_THRESHOLD_MS` (raw SQL included)
+    with redacted binds, the calling repository method and, captured in the
+    background on a separate unpooled connection, their `EXPLAIN (FORMAT JSON)`
+    plan.
+    """
+    if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+        return
+
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    for name, engine in engines.items():
+        explain_engine = create_async_engine(engine.url, poolclass=NullPool)
+
+        def after_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany,
+            name=name, explain_engine=explain_engine,
+        ):
+            started = conn.info.get("slow_query_started_at")
+            if not started:
+                return
+            duration = time.perf_counter() - started.pop()
+            if duration < threshold or statement.startswith("EXPLAIN"):
+                return
+
+            entry = {
+                "engine": name,
+                "statement": statement,
+                "parameters": _redact_parameters(parameters, executemany),
+                "caller": _find_caller(),
+                "duration_ms": duration * 1000,
+                "occurred_at": datetime.utcnow(),
+                "plan": None,
+            }
+            _slow_queries.append(entry)
+            logger.warning(
+                f"slow query ({entry['duration_ms']:.1f}ms) from {entry['caller']}: "
+                f"{statement[:200]}"
+            )
+
+            explain_parameters = parameters[0] if executemany and parameters else parameters
+            _schedule_explain(explain_engine, entry, statement, explain_parameters)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,114 @@
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from fastapi import Request
+from fastapi_async_sqlalchemy import db
+from loguru import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from .read_routing import mark_write
+
+
+class UnitOfWork:
+    """
+    Request-wide transaction on the request's session. Repositories only flush
+    inside it; the middleware commits once when the request succeeded and rolls
+    everything back otherwise.
+    """
+
+    __slots__ = ("session", "has_writes", "callbacks")
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.has_writes = False
+        self.callbacks: list[Callable[[], Awaitable[None]]] = []
+
+
+_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+def get_unit_of_work(db_session: AsyncSession) -> UnitOfWork | None:
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is None or unit_of_work.session is not db_session:
+        return None
+    return unit_of_work
+
+
+async def commit(db_session: AsyncSession) -> None:
+    """
+    Commits, or only flushes when the session belongs to the current request's
+    unit of work (scripts and explicit sessions still commit right away).
+    """
+    mark_write()
+    unit_of_work = get_unit_of_work(db_session)
+    if unit_of_work is None:
+        await db_session.commit()
+        return
+
+    unit_of_work.has_writes = True
+    await db_session.flush()
+
+
+async def on_commit(
+    db_session: AsyncSession, callback: Callable[[], Awaitable[None]]
+) -> None:
+    """
+    Runs `callback` once the writes are durable, e.g. cache invalidation that
+    must not race a not-yet-committed transaction.
+    """
+    unit_of_work = get_unit_of_work(db_session)
+    if unit_of_work is None:
+        await callback()
+        return
+
+    unit_of_work.callbacks.append(callback)
+
+
+@asynccontextmanager
+async def savepoint(db_session: AsyncSession):
+    """
+    Lets a statement fail (and be rolled back) alone without discarding the
+    rest of the request's unit of work.
+    """
+    if get_unit_of_work(db_session) is None:
+        yield
+        return
+
+    async with db_session.begin_nested():
+        yield
+
+
+class UnitOfWorkMiddleware(BaseHTTPMiddleware):
+    """
+    Must run inside `SQLAlchemyMiddleware`, whose session it commits.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+        unit_of_work = UnitOfWork(db.session)
+        token = _unit_of_work.set(unit_of_work)
+        try:
+            response = await call_next(request)
+        except Exception:
+            await unit_of_work.session.rollback()
+            raise
+        finally:
+            _unit_of_work.reset(token)
+
+        if not unit_of_work.has_writes:
+            return response
+
+        if response.status_code >= 400:
+            await unit_of_work.session.rollback()
+            return response
+
+        await unit_of_work.session.commit()
+        for callback in unit_of_work.callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("on_commit callback failed")
+        return response
@@ -7,6 +7,7 @@ class HttpErrorEnum(str, Enum):
     ACCESS_EXPIRED = "ACCESS_EXPIRED"
     REFRESH_EXPIRED = "REFRESH_EXPIRED"
     INACTIVE_USER = "INACTIVE_USER"
+    INVALID_CURSOR = "INVALID_CURSOR"
 
 class HttpErrorMessage(str, Enum):
     ACCESS_EXPIRED = "access token is expired"
@@ -14,6 +14,17 @@ class IOrderEnum(str, Enum):
     descendent = "descendent"
 
 
+class ICountModeEnum(str, Enum):
+    # COUNT(*) over the filtered query, per request
+    exact = "exact"
+    # No total, only whether a next page exists
+    none = "none"
+    # Planner estimate (pg_class.reltuples) of the whole table
+    estimate = "estimate"
+    # Exact count shared through Redis for a short TTL
+    cached = "cached"
+
+
 class TokenType(str, Enum):
     ACCESS = "access"
     REFRESH = "refresh"
@@ -1,19 +1,32 @@
 from typing import Any, Generic, TypeVar
 from collections.abc import Sequence
 from math import ceil
+from fastapi import Query
 from pydantic import BaseModel
 
 from pydantic.generics import GenericModel
 from fastapi_pagination import Params, Page
 from fastapi_pagination.bases import AbstractPage, AbstractParams
 
+from .common_schema import ICountModeEnum
+
 
 DataType = TypeVar("DataType")
 T = TypeVar("T")
 
 
+class CursorParams(BaseModel):
+    cursor: str | None = Query(None, description="Cursor returned by the previous page")
+    size: int = Query(50, ge=1, le=100, description="Page size")
+
+
 class PageBase(Page[T], Generic[T]):
-    pages: int
+    # total, page and pages are left empty in cursor mode, which skips the COUNT query
+    total: int | None = None
+    pages: int | None = None
+    total_mode: ICountModeEnum | None = None
+    has_next: bool | None = None
+    next_cursor: str | None = None
     # next_page: int | None
     # previous_page: int | None
 
@@ -35,10 +48,17 @@ class IResponsePage(AbstractPage[T], Generic[T]):
     def create(
         cls,
         items: Sequence[T],
-        total: int,
+        total: int | None,
         params: AbstractParams,
+        total_mode: ICountModeEnum = ICountModeEnum.exact,
+        has_next: bool | None = None,
     ) -> PageBase[T] | None:
-        if params.size is not None and total is not None and params.size != 0:
+        if has_next is None and total is not None:
+            has_next = params.page * params.size < total
+
+        if total is None:
+            pages = None
+        elif params.size is not None and params.size != 0:
             pages = ceil(total / params.size)
         else:
             pages = 0
@@ -51,11 +71,30 @@ class IResponsePage(AbstractPage[T], Generic[T]):
                 size=params.size,
                 total=total,
                 pages=pages,
+                total_mode=total_mode,
+                has_next=has_next,
                 # next_page=params.page + 1 if params.page < pages else None,
                 # previous_page=params.page - 1 if params.page > 1 else None,
             )
         )
 
+    @classmethod
+    def create_cursor(
+        cls,
+        items: Sequence[T],
+        params: CursorParams,
+        next_cursor: str | None,
+    ) -> PageBase[T] | None:
+        return cls(
+            data=PageBase(
+                items=items,
+                size=params.size,
+                total_mode=ICountModeEnum.none,
+                has_next=next_cursor is not None,
+                next_cursor=next_cursor,
+            )
+        )
+
 
 class IGetResponseBase(IResponseBase[DataType], Generic[DataType]):
     message: str | None = "success"
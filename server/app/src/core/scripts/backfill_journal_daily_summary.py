@@ -0,0 +1,62 @@
+import asyncio
+from collections import defaultdict
+
+from loguru import logger
+from sqlmodel import select
+
+from ..db.redis import close_redis_client
+from ..db.session import SessionLocal
+
+from ...apps.models.journal_model import Journal
+from ...apps.repositories.journal_daily_summary_repository import (
+    get_journal_daily_summary_repository,
+)
+from ...apps.services.journal_cache_service import journal_cache_service
+
+# Users per transaction, keeps each INSERT ... SELECT short
+BATCH_SIZE = 500
+
+
+async def backfill_journal_daily_summary() -> None:
+    summary_repository = get_journal_daily_summary_repository()
+
+    last_user_id = 0
+    while True:
+        async with SessionLocal() as session:
+            response = await session.execute(
+                select(Journal.user_id)
+                .where(Journal.user_id > last_user_id)
+                .group_by(Journal.user_id)
+                .order_by(Journal.user_id)
+                .limit(BATCH_SIZE)
+            )
+            user_ids = response.scalars().all()
+            if not user_ids:
+                break
+
+            created = await summary_repository.backfill(
+                user_ids=user_ids, db_session=session
+            )
+
+        # Months cached while their summaries were missing would stay empty
+        days_by_user = defaultdict(list)
+        for user_id, day in created:
+            days_by_user[user_id].append(day)
+        for user_id, days in days_by_user.items():
+            await journal_cache_service.invalidate(user_id, *days)
+
+        logger.info(
+            f"users {user_ids[0]}..{user_ids[-1]}: {len(created)} daily summaries created"
+        )
+        last_user_id = user_ids[-1]
+
+
+async def main() -> None:
+    try:
+        await backfill_journal_daily_summary()
+    finally:
+        await close_redis_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+import hashlib
 from typing import Any
 from datetime import datetime, timedelta
 
@@ -39,6 +40,10 @@ def create_token(
     return encoded_jwt
 
 
+def get_token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 """
 Currently unused
 """
@@ -0,0 +1,42 @@
+from typing import Any
+
+from jose import jwt
+from fastapi import Request
+
+from ...config import settings
+from ..lru_cache import LRUCache
+from .security import ALGORITHM, get_token_digest
+
+
+# Verified claims keyed by token digest, each entry lives until the token's `exp`
+claims_cache: LRUCache[dict[str, Any]] = LRUCache(
+    max_size=settings.TOKEN_CLAIMS_CACHE_SIZE
+)
+
+
+def decode_token(token: str) -> dict[str, Any]:
+    """
+    Verifies one of our own tokens and returns its claims.
+    Raises the same `jose` errors as `jwt.decode`; failures are never cached.
+    """
+    digest = get_token_digest(token)
+    claims = claims_cache.get(digest)
+    if claims is None:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        claims_cache.set(digest, claims, expires_at=claims.get("exp"))
+
+    return claims
+
+
+def get_verified_claims(request: Request, token: str) -> dict[str, Any]:
+    """
+    Same as `decode_token`, but memoized on `request.state` so the rate limiter
+    identifier and the auth dependency share a single verification per request.
+    """
+    verified = getattr(request.state, "token_claims", None)
+    if verified is not None and verified[0] == token:
+        return verified[1]
+
+    claims = decode_token(token)
+    request.state.token_claims = (token, claims)
+    return claims
@@ -0,0 +1,128 @@
+import hashlib
+from collections.abc import Callable, Coroutine
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag from values that change whenever the representation does,
+    e.g. a row's id and `updated_at`.
+    """
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _make_body_etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def _to_utc(value: datetime) -> datetime:
+    # Naive timestamps (`updated_at`) are in the server's local zone
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(timezone.utc)
+
+
+def _to_http_date(value: datetime) -> str:
+    return format_datetime(_to_utc(value), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def is_not_modified(
+    request: Request, etag: str | None, last_modified: datetime | None = None
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Takes precedence over If-Modified-Since (RFC 7232, 3.3)
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    return _to_utc(last_modified).replace(microsecond=0) <= since
+
+
+def _set_validators(
+    response: Response, etag: str | None, last_modified: datetime | None
+) -> None:
+    if etag is not None:
+        response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _to_http_date(last_modified)
+    response.headers.setdefault("Cache-Control", CACHE_CONTROL)
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response | None:
+    """
+    Sets the validators on the route's `response` and returns a 304 when the
+    client's copy is still current, so the endpoint can skip building the body.
+    """
+    _set_validators(response, etag, last_modified)
+    if not is_not_modified(request, etag, last_modified):
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers)
+    )
+
+
+class ConditionalRoute(APIRoute):
+    """
+    Gives successful GET responses a strong ETag and answers matching
+    `If-None-Match` with 304.
+
+    Endpoints that can tell from a row version whether anything changed set it
+    with `check_not_modified`; the others get a hash of the serialized body,
+    which still saves the transfer.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def conditional_route_handler(request: Request) -> Response:
+            response = await original_route_handler(request)
+            if request.method != "GET" or response.status_code != status.HTTP_200_OK:
+                return response
+
+            body = getattr(response, "body", None)
+            if body is None:
+                return response
+
+            etag = response.headers.get("etag")
+            if etag is None:
+                etag = _make_body_etag(body)
+                _set_validators(response, etag, None)
+
+            if is_not_modified(request, etag):
+                headers = {
+                    key: value
+                    for key, value in response.headers.items()
+                    if key in ("etag", "last-modified", "cache-control")
+                }
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return response
+
+        return conditional_route_handler
@@ -0,0 +1,28 @@
+import base64
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """
+    Packs the keyset of the last row of a page into an opaque, url-safe string.
+    """
+    raw = json.dumps(jsonable_encoder(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """
+    Reverses `encode_cursor`. Raises `ValueError` on anything it did not produce.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError("malformed cursor") from e
+
+    if not isinstance(values, list):
+        raise ValueError("malformed cursor")
+    return values
@@ -9,9 +9,11 @@ from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from fastapi_limiter import FastAPILimiter
 
-from ..db.redis import get_redis_client
-from ..config import settings
-from .auth import security
+from ..db.redis import init_redis_client, close_redis_client
+from .auth.token_claims import get_verified_claims
+from ...apps.services.oauth_client import kakao_client, apple_client
+from ...apps.services.apple_client_secret import apple_client_secret_provider
+from ...apps.services.catalog_service import catalog_cache
 
 
 async def user_id_identifier(request: Request):
@@ -25,17 +27,13 @@ async def user_id_identifier(request: Request):
             if len(header_parts) == 2 and header_parts[0].lower() == "bearer":
                 token = header_parts[1]
                 try:
-                    payload = jwt.decode(
-                        token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-                    )
+                    payload = get_verified_claims(request, token)
                 except (jwt.JWTError, ValidationError):
                     raise HTTPException(
                         status_code=status.HTTP_403_FORBIDDEN,
                         detail="Could not validate credentials",
                     )
-                user_id = payload["sub"]
-                print("here2", user_id)
-                return user_id
+                return payload["sub"]
 
     if request.scope["type"] == "websocket":
         return request.scope["path"]
@@ -51,14 +49,24 @@ async def user_id_identifier(request: Request):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    redis_client = await get_redis_client()
+    redis_client = init_redis_client()
     FastAPICache.init(RedisBackend(redis_client), prefix="fastapi-cache")
     await FastAPILimiter.init(redis_client, identifier=user_id_identifier)
+    await kakao_client.open_session()
+    await apple_client.open_session()
+    await apple_client_secret_provider.start()
+    await catalog_cache.start()
 
     print("startup fastapi")
     yield
-    # shutdown
+    # shutdown, in reverse: the background refreshes still use Redis and the
+    # OAuth sessions until they are stopped
+    await catalog_cache.stop()
+    await apple_client_secret_provider.stop()
+    await apple_client.close_session()
+    await kakao_client.close_session()
     await FastAPICache.clear()
     await FastAPILimiter.close()
+    await close_redis_client()
 
     gc.collect()
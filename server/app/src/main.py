@@ -9,15 +9,18 @@ from loguru import logger
 
 from .core.config import settings
 from .core.utils.lifespan import lifespan
+from .core.db.query_stats import QueryStatsMiddleware, install_query_stats
+from .core.db.read_routing import ReadReplicaMiddleware
+from .core.db.session import engine, get_engines
+from .core.db.slow_query_log import install_slow_query_log
+from .core.db.unit_of_work import UnitOfWorkMiddleware
 from .core.constants.constant import PRODUCTION
 from .core.log.custom_logging import CustomizeLogger
 from .apps.routes import api_router as api_router_v1
 
-echo = True
 level = logging.DEBUG
 openapi_url=f"{settings.API_V1_STR}/openapi.json"
 if settings.APP_ENV == PRODUCTION:
-    echo = False
     openapi_url = None
     level = logging.INFO
     
@@ -48,16 +51,13 @@ async def log_request_middleware(request: Request, call_next):
 # 미들웨어 등록
 app.middleware("http")(log_request_middleware)
 
-app.add_middleware(
-    SQLAlchemyMiddleware,
-    db_url=settings.ASYNC_DATABASE_URI,
-    engine_args={
-        "echo": echo,
-        "pool_pre_ping": True,
-        "pool_size": settings.POOL_SIZE,
-        "max_overflow": 64,
-    },
-)
+# Added first so it runs inside SQLAlchemyMiddleware and can commit its session
+app.add_middleware(UnitOfWorkMiddleware)
+app.add_middleware(SQLAlchemyMiddleware, custom_engine=engine)
+app.add_middleware(ReadReplicaMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+install_query_stats(list(get_engines().values()))
+install_slow_query_log(get_engines())
 
 # Set all CORS origins enabled
 if settings.BACKEND_CORS_ORIGINS:
@@ -0,0 +1,178 @@
+import os
+
+# Settings are read on import, the values only need to be well-formed
+for key, value in {
+    "APP_ENV": "test",
+    "PROJECT_NAME": "test",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_MINUTES": "600",
+    "DATABASE_HOST": "localhost",
+    "DATABASE_USER": "test",
+    "DATABASE_PASSWORD": "test",
+    "DATABASE_PORT": "5432",
+    "DATABASE_NAME": "test",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "FIRST_SUPERUSER_EMAIL": "admin@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "test",
+    "BACKEND_CORS_ORIGINS": "http://localhost",
+    "KAKAO_CLIENT_ID": "test",
+    "KAKAO_CLIENT_SECRET_ID": "test",
+    "KAKAO_REDIRECT_URI": "http://localhost/kakao",
+    "APPLE_CLIENT_ID": "test",
+    "APPLE_REDIRECT_URI": "http://localhost/apple",
+    "APPLE_TEAM_ID": "test",
+    "APPLE_KEY_ID": "test",
+    "AWS_DEFAULT_REGION": "ap-northeast-2",
+    "AWS_STORAGE_BUCKET_NAME": "test",
+    "APPLE_AUTH_KEY": "test",
+    "ENCRYPT_KEY": "32LhDpTjPj077JEqyq930pu8LRDeMN_Hg9ttI_mJZcQ=",
+}.items():
+    os.environ.setdefault(key, value)
+
+import uuid  # noqa: E402
+
+import anyio  # noqa: E402
+import pytest  # noqa: E402
+from fakeredis import aioredis  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+# Every model, so relationships between them can be resolved
+from src.apps.models import (  # noqa: E402,F401
+    community_model,
+    journal_model,
+    mood_model,
+    role_model,
+    user_model,
+)
+from src.core.db import redis  # noqa: E402
+
+# Tables the database tests need; the others use PostgreSQL-only types (ARRAY)
+# that the SQLite tests can't create
+TEST_TABLES = [
+    role_model.Role.__table__,
+    user_model.User.__table__,
+    mood_model.MoodMacroStatus.__table__,
+    mood_model.MoodMicroStatus.__table__,
+]
+PG_TABLES = TEST_TABLES + [
+    journal_model.Journal.__table__,
+    journal_model.JournalDailySummary.__table__,
+]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def redis_client(monkeypatch):
+    client = aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis, "redis_client", client)
+    yield client
+    await client.flushall()
+    await client.close()
+
+
+@pytest.fixture
+async def db_engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: TEST_TABLES[0].metadata.create_all(
+                sync_conn, tables=TEST_TABLES
+            )
+        )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(db_engine):
+    Session = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    async with Session() as session:
+        yield session
+
+
+@pytest.fixture
+async def pg_session():
+    """
+    Session on PostgreSQL, for statements SQLite can't run (RETURNING, ARRAY
+    binds, COPY). Skipped unless `TEST_ASYNC_DATABASE_URI` points to a
+    database; the tables live in a throwaway schema.
+    """
+    uri = os.environ.get("TEST_ASYNC_DATABASE_URI")
+    if not uri:
+        pytest.skip("TEST_ASYNC_DATABASE_URI is not set")
+
+    schema = f"test_{uuid.uuid4().hex}"
+    engine = create_async_engine(
+        uri, connect_args={"server_settings": {"search_path": schema}}
+    )
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(f'CREATE SCHEMA "{schema}"')
+        await conn.run_sync(
+            lambda sync_conn: PG_TABLES[0].metadata.create_all(
+                sync_conn, tables=PG_TABLES
+            )
+        )
+    try:
+        Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with Session() as session:
+            yield session
+    finally:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql(f'DROP SCHEMA "{schema}" CASCADE')
+        await engine.dispose()
+
+
+async def asgi_request(
+    app, method: str, path: str, headers: dict[str, str] | None = None
+) -> tuple[int, dict[str, str], bytes]:
+    """
+    Sends one request straight to the ASGI `app`.
+    Returns its status, headers and body.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (key.lower().encode(), value.encode())
+            for key, value in (headers or {}).items()
+        ],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+    request_sent = False
+    response_complete = anyio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Middleware listening for a disconnect waits until the response is out
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            response_complete.set()
+
+    await app(scope, receive, send)
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    response_headers = {key.decode(): value.decode() for key, value in start["headers"]}
+    return start["status"], response_headers, body
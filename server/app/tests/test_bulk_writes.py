@@ -0,0 +1,76 @@
+import pytest
+from sqlmodel import select
+
+from src.apps.models.role_model import Role
+from src.core.base_repository import BaseRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_roles(db_session, *names: str) -> list[Role]:
+    roles = [Role(name=name, description="") for name in names]
+    db_session.add_all(roles)
+    await db_session.commit()
+    return roles
+
+
+async def get_names(db_session) -> list[str]:
+    response = await db_session.execute(select(Role.name).order_by(Role.id))
+    return response.scalars().all()
+
+
+async def test_delete_many_by_ids_removes_rows_and_instances(pg_session):
+    a, b, c = await add_roles(pg_session, "a", "b", "c")
+
+    deleted_ids = await BaseRepository(Role).delete_many(
+        ids=[a.id, c.id], db_session=pg_session
+    )
+
+    assert sorted(deleted_ids) == sorted([a.id, c.id])
+    assert await get_names(pg_session) == ["b"]
+    assert a not in pg_session and c not in pg_session
+    assert b in pg_session
+
+
+async def test_delete_many_by_where(pg_session):
+    await add_roles(pg_session, "a", "b", "a")
+
+    deleted_ids = await BaseRepository(Role).delete_many(
+        where=[Role.name == "a"], db_session=pg_session
+    )
+
+    assert len(deleted_ids) == 2
+    assert await get_names(pg_session) == ["b"]
+
+
+async def test_update_many_refreshes_loaded_instances(pg_session):
+    a, b = await add_roles(pg_session, "a", "b")
+
+    updated = await BaseRepository(Role).update_many(
+        ids=[a.id], values={"name": "renamed"}, db_session=pg_session
+    )
+
+    assert [role.id for role in updated] == [a.id]
+    assert a.name == "renamed"
+    assert await get_names(pg_session) == ["renamed", "b"]
+
+
+async def test_copy_many_copies_every_column(pg_session):
+    copied = await BaseRepository(Role).copy_many(
+        objs_in=[Role(name="a", description="first"), Role(name="b", description=None)],
+        db_session=pg_session,
+    )
+
+    assert copied == 2
+    response = await pg_session.execute(
+        select(Role.name, Role.description).order_by(Role.name)
+    )
+    assert response.all() == [("a", "first"), ("b", None)]
+
+
+async def test_copy_many_rejects_ids_given_for_some_rows_only(db_session):
+    with pytest.raises(ValueError):
+        await BaseRepository(Role).copy_many(
+            objs_in=[Role(id=10, name="a", description=""), Role(name="b", description="")],
+            db_session=db_session,
+        )
@@ -0,0 +1,107 @@
+import time
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI, Request, Response
+
+from src.core.utils.conditional import (
+    ConditionalRoute,
+    _to_http_date,
+    check_not_modified,
+    is_not_modified,
+    make_etag,
+)
+
+from .conftest import asgi_request
+
+pytestmark = pytest.mark.anyio
+
+UPDATED_AT = datetime(2024, 1, 1, 9, 0, 0, 500000)
+
+
+@pytest.fixture
+def seoul_time(monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Seoul")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def _request(headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def test_naive_datetimes_are_local_time(seoul_time):
+    assert _to_http_date(UPDATED_AT) == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_if_modified_since_compares_local_time(seoul_time):
+    current = _request({"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    stale = _request({"If-Modified-Since": "Sun, 31 Dec 2023 23:59:59 GMT"})
+
+    assert is_not_modified(current, None, UPDATED_AT)
+    assert not is_not_modified(stale, None, UPDATED_AT)
+
+
+def test_if_none_match_takes_precedence():
+    etag = make_etag(1, UPDATED_AT)
+    request = _request(
+        {"If-None-Match": 'W/"other", ' + etag, "If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}
+    )
+
+    assert is_not_modified(request, etag, UPDATED_AT)
+    assert not is_not_modified(_request({"If-None-Match": '"other"'}), etag, UPDATED_AT)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.router.route_class = ConditionalRoute
+
+    @app.get("/body")
+    async def body():
+        return {"value": 1}
+
+    @app.get("/row")
+    async def row(request: Request, response: Response):
+        not_modified = check_not_modified(
+            request, response, make_etag(1, UPDATED_AT), UPDATED_AT
+        )
+        if not_modified is not None:
+            return not_modified
+        return {"value": 1}
+
+    return app
+
+
+async def test_body_etag_answers_304():
+    app = _app()
+    status, headers, _ = await asgi_request(app, "GET", "/body")
+    assert status == 200
+
+    status, revalidated, body = await asgi_request(
+        app, "GET", "/body", {"If-None-Match": headers["etag"]}
+    )
+    assert status == 304
+    assert body == b""
+    assert revalidated["etag"] == headers["etag"]
+
+
+async def test_row_version_answers_304():
+    app = _app()
+    status, headers, _ = await asgi_request(app, "GET", "/row")
+    assert status == 200
+    assert headers["etag"] == make_etag(1, UPDATED_AT)
+    assert "last-modified" in headers
+
+    status, _, _ = await asgi_request(
+        app, "GET", "/row", {"If-None-Match": headers["etag"]}
+    )
+    assert status == 304
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from src.apps.models.role_model import Role
+from src.core.base_repository import BaseRepository
+from src.core.exceptions.common_exception import BadRequestException
+from src.core.schemas.common_schema import IOrderEnum
+from src.core.schemas.response_schema import CursorParams
+from src.core.utils.cursor import encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+# Ties on `name` are broken by `id`
+NAMES = ["b", "a", "b", "a", "c", "a", "b"]
+
+
+@pytest.fixture
+async def role_repository(db_session):
+    db_session.add_all(Role(name=name, description="") for name in NAMES)
+    await db_session.commit()
+    return BaseRepository(Role)
+
+
+async def paginate(repository, db_session, size, **kwargs) -> list[list[Role]]:
+    pages, cursor = [], None
+    while True:
+        response = await repository.get_multi_cursor_paginated(
+            params=CursorParams(cursor=cursor, size=size),
+            db_session=db_session,
+            **kwargs,
+        )
+        page = response.data
+        pages.append(page.items)
+        assert page.has_next == (page.next_cursor is not None)
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 10])
+@pytest.mark.parametrize("order", [IOrderEnum.ascendent, IOrderEnum.descendent])
+async def test_pages_cover_ties_once_in_order(role_repository, db_session, size, order):
+    pages = await paginate(
+        role_repository, db_session, size, order_by="name", order=order
+    )
+    keys = [(role.name, role.id) for page in pages for role in page]
+
+    expected = sorted(
+        ((name, id) for id, name in enumerate(NAMES, start=1)),
+        reverse=order == IOrderEnum.descendent,
+    )
+    assert keys == expected
+    assert all(len(page) == size for page in pages[:-1])
+
+
+async def test_last_page_of_exact_size_has_no_next(role_repository, db_session):
+    pages = await paginate(role_repository, db_session, size=len(NAMES))
+    assert [len(page) for page in pages] == [len(NAMES)]
+
+
+async def test_cursor_past_the_end_returns_empty_last_page(role_repository, db_session):
+    response = await role_repository.get_multi_cursor_paginated(
+        params=CursorParams(cursor=encode_cursor([len(NAMES)]), size=2),
+        db_session=db_session,
+    )
+    assert response.data.items == []
+    assert response.data.has_next is False
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        encode_cursor({"id": 1}),
+        # A cursor of the `id` ordering used with the `name` ordering
+        encode_cursor([3]),
+        encode_cursor(["a", "not an id"]),
+    ],
+)
+async def test_invalid_cursor_is_rejected(role_repository, db_session, cursor):
+    with pytest.raises(BadRequestException):
+        await role_repository.get_multi_cursor_paginated(
+            params=CursorParams(cursor=cursor, size=2),
+            order_by="name",
+            db_session=db_session,
+        )
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 10])
+@pytest.mark.parametrize("order", [IOrderEnum.ascendent, IOrderEnum.descendent])
+async def test_nullable_column_pages_keep_nulls_last(db_session, size, order):
+    created = [
+        datetime(2024, 1, 2),
+        None,
+        datetime(2024, 1, 1),
+        None,
+        datetime(2024, 1, 2),
+        None,
+    ]
+    db_session.add_all(
+        Role(name="role", description="", created_at=created_at) for created_at in created
+    )
+    await db_session.commit()
+    # The default factory fills in a missing `created_at` on insert
+    await db_session.execute(
+        update(Role)
+        .where(Role.id.in_([id for id, value in enumerate(created, start=1) if value is None]))
+        .values(created_at=None)
+    )
+    await db_session.commit()
+
+    pages = await paginate(
+        BaseRepository(Role), db_session, size, order_by="created_at", order=order
+    )
+    ids = [role.id for page in pages for role in page]
+
+    is_descendent = order == IOrderEnum.descendent
+    dated = sorted(
+        ((created_at, id) for id, created_at in enumerate(created, start=1) if created_at),
+        reverse=is_descendent,
+    )
+    nulls = sorted(
+        (id for id, created_at in enumerate(created, start=1) if created_at is None),
+        reverse=is_descendent,
+    )
+    assert ids == [id for _, id in dated] + nulls
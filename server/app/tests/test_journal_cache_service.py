@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+
+from src.apps.services.journal_cache_service import JournalCacheService
+
+pytestmark = pytest.mark.anyio
+
+JANUARY = (date(2024, 1, 1), date(2024, 1, 31))
+FEBRUARY = (date(2024, 2, 1), date(2024, 2, 29))
+
+
+@pytest.fixture
+def cache(redis_client):
+    FastAPICache.init(RedisBackend(redis_client), prefix="test-cache")
+    yield JournalCacheService(ttl=60, max_months=3)
+    FastAPICache.reset()
+
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+async def test_invalidate_only_misses_the_written_month(cache):
+    january, february = Loader(["a"]), Loader(["b"])
+    await cache.get(1, "month", *JANUARY, january)
+    await cache.get(1, "month", *FEBRUARY, february)
+
+    january.value = ["a", "c"]
+    await cache.invalidate(1, date(2024, 1, 15))
+
+    assert await cache.get(1, "month", *JANUARY, january) == ["a", "c"]
+    assert await cache.get(1, "month", *FEBRUARY, february) == ["b"]
+    assert (january.calls, february.calls) == (2, 1)
+
+
+async def test_lost_version_does_not_revive_old_entries(cache, redis_client):
+    loader = Loader(["a"])
+    await cache.get(1, "month", *JANUARY, loader)
+    await cache.invalidate(1, date(2024, 1, 15))
+    await cache.get(1, "month", *JANUARY, loader)
+
+    # An evicted version key used to fall back to "0", matching entries
+    # cached before the first write
+    await redis_client.delete(cache._generate_version_key(1, "2024-01"))
+    loader.value = ["b"]
+
+    assert await cache.get(1, "month", *JANUARY, loader) == ["b"]
+    assert loader.calls == 3
+    assert await redis_client.ttl(cache._generate_version_key(1, "2024-01")) == -1
@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+from sqlmodel import select
+
+from src.apps.models.journal_model import (
+    Journal,
+    JournalDailySummary,
+    TopicEnum,
+    WithWhomEnum,
+)
+from src.apps.models.mood_model import MoodMacroStatus, MoodMicroStatus
+from src.apps.models.user_model import User
+from src.apps.repositories.journal_respository import JournalRepository
+
+pytestmark = pytest.mark.anyio
+
+FIRST, SECOND = date(2024, 1, 1), date(2024, 1, 2)
+
+
+async def make_journals(db_session, *days: date) -> list[Journal]:
+    user = User(user_name="user", oauth_provider="kakao", provider_user_id="1")
+    macro = MoodMacroStatus(mood_macro="macro")
+    db_session.add_all([user, macro])
+    await db_session.flush()
+    micro = MoodMicroStatus(mood_micro="micro", mood_macro_status_id=macro.id)
+    db_session.add(micro)
+    await db_session.commit()
+
+    return [
+        Journal(
+            user_id=user.id,
+            with_whom=WithWhomEnum.alone,
+            topic=[TopicEnum.etc],
+            reason="reason",
+            action_from_emotion="action",
+            context="context",
+            journal_time_at=day,
+            mood_macro_status_id=macro.id,
+            mood_micro_status_id=micro.id,
+        )
+        for day in days
+    ]
+
+
+async def get_summaries(db_session) -> dict[date, int]:
+    response = await db_session.execute(
+        select(JournalDailySummary.day, JournalDailySummary.journal_count)
+    )
+    return dict(response.all())
+
+
+async def test_bulk_writes_keep_daily_summaries(pg_session, redis_client):
+    repository = JournalRepository(Journal)
+    journals = await repository.create_many(
+        objs_in=await make_journals(pg_session, FIRST, FIRST, SECOND),
+        db_session=pg_session,
+    )
+    assert await get_summaries(pg_session) == {FIRST: 2, SECOND: 1}
+
+    await repository.update_many(
+        values={"journal_time_at": SECOND},
+        ids=[journals[0].id],
+        db_session=pg_session,
+    )
+    assert await get_summaries(pg_session) == {FIRST: 1, SECOND: 2}
+
+    await repository.delete_many(
+        where=[Journal.journal_time_at == FIRST], db_session=pg_session
+    )
+    assert await get_summaries(pg_session) == {SECOND: 2}
+
+
+async def test_bulk_writes_invalidate_the_cached_month(pg_session, redis_client):
+    repository = JournalRepository(Journal)
+    objs_in = await make_journals(pg_session, FIRST)
+    version_key = f"journal:{objs_in[0].user_id}:2024-01:cache_version"
+
+    await repository.create_many(objs_in=objs_in, db_session=pg_session)
+    created_version = await redis_client.get(version_key)
+    assert created_version is not None
+
+    await repository.delete_many(
+        where=[Journal.user_id == objs_in[0].user_id], db_session=pg_session
+    )
+    assert await redis_client.get(version_key) != created_version
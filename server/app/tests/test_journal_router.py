@@ -0,0 +1,117 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import select
+
+from src.apps.models.journal_model import Journal, TopicEnum, WithWhomEnum
+from src.apps.models.mood_model import MoodMacroStatus, MoodMicroStatus
+from src.apps.models.user_model import User
+from src.apps.repositories.journal_respository import JournalRepository
+from src.apps.routers.journal_router import (
+    _to_journal_read,
+    create_journal,
+    update_journal,
+)
+from src.core.base_service import S3_BASE_URL
+from src.core.db.unit_of_work import UnitOfWork, _unit_of_work
+
+pytestmark = pytest.mark.anyio
+
+IMAGES = ["journal/1/a.png", "journal/1/b.png"]
+
+
+def test_response_leaves_the_journal_images_alone():
+    journal = Journal(
+        id=1,
+        user_id=1,
+        with_whom=WithWhomEnum.alone,
+        topic=[TopicEnum.etc],
+        reason="reason",
+        action_from_emotion="action",
+        context="context",
+        journal_time_at=date(2024, 1, 1),
+        mood_macro_status_id=1,
+        mood_micro_status_id=1,
+        images=list(IMAGES),
+    )
+
+    read = _to_journal_read(journal)
+
+    assert read.images == {"base_url": S3_BASE_URL, "detail_path": IMAGES}
+    assert journal.images == IMAGES
+
+
+async def run_in_unit_of_work(db_session, endpoint, **kwargs):
+    """
+    Calls the endpoint like UnitOfWorkMiddleware does: writes are only
+    flushed while it runs, and committed once it has returned.
+    """
+    token = _unit_of_work.set(UnitOfWork(db_session))
+    try:
+        response = await endpoint(**kwargs)
+    finally:
+        _unit_of_work.reset(token)
+    await db_session.commit()
+    return response
+
+
+async def test_create_and_update_keep_s3_keys_in_the_database(pg_session, monkeypatch):
+    user = User(user_name="user", oauth_provider="kakao", provider_user_id="1")
+    macro = MoodMacroStatus(mood_macro="macro")
+    pg_session.add_all([user, macro])
+    await pg_session.flush()
+    micro = MoodMicroStatus(mood_micro="micro", mood_macro_status_id=macro.id)
+    pg_session.add(micro)
+    await pg_session.commit()
+
+    async def upload(files, user_id):
+        return list(IMAGES)
+
+    async def no_cache(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr("src.apps.routers.journal_router.s3_journal_middleware", upload)
+    monkeypatch.setattr(
+        "src.apps.repositories.journal_respository.journal_cache_service.invalidate",
+        no_cache,
+    )
+    journal_repository = JournalRepository(Journal)
+    journal_repository.db = SimpleNamespace(session=pg_session)
+    fields = {
+        "with_whom": WithWhomEnum.alone,
+        "topic": [TopicEnum.etc],
+        "reason": "reason",
+        "action_from_emotion": "action",
+        "context": "context",
+        "journal_time_at": date(2024, 1, 1),
+        "mood_macro_status_id": macro.id,
+        "mood_micro_status_id": micro.id,
+        "journal_repository": journal_repository,
+        "current_user": user,
+    }
+
+    async def read_images(journal_id: int) -> list[str]:
+        pg_session.expire_all()
+        response = await pg_session.execute(
+            select(Journal.images).where(Journal.id == journal_id)
+        )
+        return response.scalar_one()
+
+    created = await run_in_unit_of_work(
+        pg_session, create_journal, files=["upload"], **fields
+    )
+    journal_id = created["data"].id
+    assert created["data"].images["detail_path"] == IMAGES
+    assert await read_images(journal_id) == IMAGES
+
+    updated = await run_in_unit_of_work(
+        pg_session,
+        update_journal,
+        journal_id=journal_id,
+        images=IMAGES[:1],
+        files=None,
+        **{**fields, "context": "edited"},
+    )
+    assert updated["data"].images["detail_path"] == IMAGES[:1]
+    assert await read_images(journal_id) == IMAGES[:1]
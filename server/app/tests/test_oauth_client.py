@@ -0,0 +1,68 @@
+import aiohttp
+import pytest
+
+from src.apps.services.oauth_client import OAuthClient
+
+pytestmark = pytest.mark.anyio
+
+
+def make_key(kid: str) -> dict:
+    return {"kty": "oct", "k": "c2VjcmV0", "alg": "HS256", "kid": kid}
+
+
+class StubKeysClient(OAuthClient):
+    """
+    Answers the JWKS request from `responses` instead of the provider.
+    """
+
+    def __init__(self, *responses):
+        super().__init__(
+            provider_name="apple",
+            client_id="client",
+            client_secret_func=lambda: "secret",
+            redirect_uri="",
+            authentication_uri="https://provider.test/auth",
+            resource_uri="",
+            verify_uri="",
+        )
+        self.responses = list(responses)
+        self.fetches = 0
+
+    async def _request_get_with_headers_to(self, url, headers=None):
+        self.fetches += 1
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response, {"Cache-Control": "max-age=60"}
+
+
+def expire(client: OAuthClient) -> None:
+    client._public_keys_expire_at = 0.0
+    client._public_keys_retry_at = 0.0
+
+
+async def test_unknown_kid_does_not_refetch_within_min_refresh():
+    client = StubKeysClient({"keys": [make_key("a")]}, {"keys": [make_key("b")]})
+
+    assert set(await client.get_public_key("a")) == {"a"}
+    assert set(await client.get_public_key("unknown")) == {"a"}
+    assert set(await client.get_public_key("unknown")) == {"a"}
+    assert client.fetches == 1
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [aiohttp.ClientConnectionError("refused"), TimeoutError(), None],
+)
+async def test_failed_fetch_keeps_previous_keys_and_backs_off(failure):
+    client = StubKeysClient({"keys": [make_key("a")]}, failure, {"keys": [make_key("b")]})
+    await client.get_public_key("a")
+    expire(client)
+
+    assert set(await client.get_public_key("a")) == {"a"}
+    assert set(await client.get_public_key("b")) == {"a"}
+    assert client.fetches == 2
+
+    client._public_keys_retry_at = 0.0
+    assert set(await client.get_public_key("b")) == {"b"}
+    assert client.fetches == 3
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import FastAPI, Response
+
+from src.apps.models.role_model import Role
+from src.core.db import read_routing
+from src.core.db.read_routing import ReadReplicaMiddleware, get_read_session, track_user
+from src.core.db.unit_of_work import commit
+
+from .conftest import asgi_request
+
+pytestmark = pytest.mark.anyio
+
+USER_ID = 1
+
+
+@pytest.fixture
+def app(monkeypatch, db_session, redis_client):
+    # Any session factory turns routing on; the replica is never queried here
+    monkeypatch.setattr(read_routing, "ReadSessionLocal", lambda: db_session)
+
+    app = FastAPI()
+    app.add_middleware(ReadReplicaMiddleware)
+
+    async def write():
+        db_session.add(Role(name="role", description=""))
+        await commit(db_session)
+
+    @app.get("/read")
+    async def read():
+        await track_user(USER_ID)
+        return {"replica": get_read_session() is not None}
+
+    @app.get("/login-callback")
+    async def login_callback():
+        # Like the OAuth callback: a GET that writes before its user is known
+        await write()
+        await track_user(USER_ID)
+        return {"replica_after_write": get_read_session() is not None}
+
+    @app.post("/no-op")
+    async def no_op():
+        await track_user(USER_ID)
+
+    @app.post("/failed-write")
+    async def failed_write():
+        await track_user(USER_ID)
+        await write()
+        return Response(status_code=400)
+
+    return app
+
+
+async def reads_replica(app) -> bool:
+    status, _, body = await asgi_request(app, "GET", "/read")
+    assert status == 200
+    return body == b'{"replica":true}'
+
+
+async def test_reads_go_to_replica_without_writes(app, redis_client):
+    assert await reads_replica(app)
+
+    await asgi_request(app, "POST", "/no-op")
+    assert await reads_replica(app)
+    assert not await redis_client.exists(read_routing._generate_pin_key(USER_ID))
+
+
+async def test_write_in_get_pins_user_to_primary(app, redis_client):
+    status, _, body = await asgi_request(app, "GET", "/login-callback")
+    assert status == 200
+    # The rest of the writing request already reads from the primary
+    assert body == b'{"replica_after_write":false}'
+
+    assert not await reads_replica(app)
+    pin_key = read_routing._generate_pin_key(USER_ID)
+    assert 0 < await redis_client.ttl(pin_key) <= read_routing.settings.READ_YOUR_WRITES_SECONDS
+
+    await redis_client.delete(pin_key)
+    assert await reads_replica(app)
+
+
+async def test_failed_write_does_not_pin(app, redis_client):
+    status, _, _ = await asgi_request(app, "POST", "/failed-write")
+    assert status == 400
+    assert await reads_replica(app)
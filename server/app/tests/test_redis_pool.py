@@ -0,0 +1,57 @@
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.core.db.redis import InstrumentedConnectionPool
+
+pytestmark = pytest.mark.anyio
+
+
+class StubConnection:
+    def __init__(self, fail: bool):
+        self.fail = fail
+
+    async def connect(self):
+        if self.fail:
+            raise ConnectionError("refused")
+
+    async def can_read_destructive(self):
+        return False
+
+    async def disconnect(self):
+        pass
+
+
+def make_pool(max_connections: int, fail: bool = False) -> InstrumentedConnectionPool:
+    pool = InstrumentedConnectionPool(max_connections=max_connections, timeout=0.01)
+    pool.make_connection = lambda: StubConnection(fail)
+    pool.owns_connection = lambda connection: True
+    return pool
+
+
+async def test_failed_connect_is_not_counted_in_use():
+    pool = make_pool(max_connections=2, fail=True)
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await pool.get_connection("GET")
+
+    assert pool.get_stats()["in_use"] == 0
+    assert pool.get_stats()["wait_count"] == 0
+
+
+async def test_only_acquisitions_from_an_empty_queue_count_as_waits():
+    pool = make_pool(max_connections=2)
+
+    first = await pool.get_connection("GET")
+    second = await pool.get_connection("GET")
+    assert pool.get_stats()["in_use"] == 2
+    assert pool.get_stats()["wait_count"] == 0
+
+    # Pool exhausted: this caller waits and times out
+    with pytest.raises(ConnectionError):
+        await pool.get_connection("GET")
+    assert pool.get_stats()["wait_count"] == 1
+
+    await pool.release(first)
+    await pool.release(second)
+    assert pool.get_stats()["in_use"] == 0
@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.db.slow_query_log import install_slow_query_log
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_statement_drops_its_start_time():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    install_slow_query_log({"primary": engine})
+
+    async with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("SELECT * FROM missing_table"))
+        await conn.execute(text("SELECT 1"))
+
+        assert conn.sync_connection.info["slow_query_started_at"] == []
+
+    await engine.dispose()
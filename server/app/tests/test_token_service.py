@@ -0,0 +1,57 @@
+import pytest
+
+from src.apps.models.user_model import User
+from src.apps.services.token_service import TokenEntry, TokenStorageService
+from src.core.schemas.common_schema import TokenType
+
+pytestmark = pytest.mark.anyio
+
+USER = User(id=1, user_name="user", oauth_provider="kakao", provider_user_id="1")
+
+
+async def test_issue_tokens_only_registered_skips_missing_sets(redis_client):
+    token_service = TokenStorageService(redis_client)
+
+    await token_service.issue_tokens(USER, [TokenEntry("access", TokenType.ACCESS)])
+    assert await token_service.get_valid_tokens(USER.id, TokenType.ACCESS) == set()
+
+    await token_service.issue_tokens(
+        USER, [TokenEntry("access", TokenType.ACCESS)], only_registered=False
+    )
+    await token_service.issue_tokens(USER, [TokenEntry("other", TokenType.ACCESS)])
+    assert await token_service.get_valid_tokens(USER.id, TokenType.ACCESS) == {
+        "access",
+        "other",
+    }
+
+
+async def test_issue_tokens_replace_swaps_every_set_at_once(redis_client):
+    token_service = TokenStorageService(redis_client)
+    await token_service.issue_tokens(
+        USER,
+        [
+            TokenEntry("old-access", TokenType.ACCESS),
+            TokenEntry("old-refresh", TokenType.REFRESH),
+        ],
+        only_registered=False,
+    )
+
+    await token_service.issue_tokens(
+        USER,
+        [
+            TokenEntry("new-access", TokenType.ACCESS, 1),
+            TokenEntry("new-refresh", TokenType.REFRESH, 2),
+        ],
+        replace=True,
+    )
+
+    assert not await token_service.is_valid_token(USER.id, "old-access", TokenType.ACCESS)
+    assert await token_service.is_valid_token(USER.id, "new-access", TokenType.ACCESS)
+    assert await token_service.get_valid_tokens(USER.id, TokenType.REFRESH) == {
+        "new-refresh"
+    }
+    # The replaced sets get the TTL of the new tokens, not the old one's
+    access_key = token_service._generate_token_key(USER.id, TokenType.ACCESS)
+    refresh_key = token_service._generate_token_key(USER.id, TokenType.REFRESH)
+    assert 0 < await redis_client.ttl(access_key) <= 60
+    assert 60 < await redis_client.ttl(refresh_key) <= 120
@@ -0,0 +1,74 @@
+import pytest
+
+from src.apps.models.user_model import User
+from src.apps.services.user_cache_service import UserCacheService
+
+pytestmark = pytest.mark.anyio
+
+
+def make_user(user_name: str) -> User:
+    return User(id=1, user_name=user_name, oauth_provider="kakao", provider_user_id="1")
+
+
+class Loader:
+    def __init__(self, user: User):
+        self.user = user
+        self.calls = 0
+
+    async def __call__(self) -> User:
+        self.calls += 1
+        return self.user
+
+
+async def test_get_serves_cached_user_until_invalidated(redis_client):
+    cache = UserCacheService(max_size=10, ttl=60)
+    loader = Loader(make_user("before"))
+
+    assert (await cache.get(1, loader)).user_name == "before"
+    assert (await cache.get(1, loader)).user_name == "before"
+    assert loader.calls == 1
+
+    loader.user = make_user("after")
+    await cache.invalidate(1)
+    assert (await cache.get(1, loader)).user_name == "after"
+    assert loader.calls == 2
+
+
+async def test_invalidate_on_another_worker_skips_local_entry(redis_client):
+    worker, other_worker = UserCacheService(10, 60), UserCacheService(10, 60)
+    loader = Loader(make_user("before"))
+    await worker.get(1, loader)
+
+    loader.user = make_user("after")
+    await other_worker.invalidate(1)
+    assert (await worker.get(1, loader)).user_name == "after"
+
+
+async def test_expired_version_does_not_revive_stale_local_entry(redis_client):
+    worker, other_worker = UserCacheService(10, 60), UserCacheService(10, 60)
+    version_key = worker._generate_version_key(1)
+    loader = Loader(make_user("first"))
+
+    await other_worker.invalidate(1)
+    await worker.get(1, loader)
+    stale_version = await redis_client.get(version_key)
+
+    loader.user = make_user("second")
+    await other_worker.invalidate(1)
+    # The version key expires (or is evicted), then the user changes again
+    await redis_client.delete(version_key)
+    await other_worker.invalidate(1)
+
+    assert await redis_client.get(version_key) != stale_version
+    assert await redis_client.ttl(version_key) == -1
+    assert (await worker.get(1, loader)).user_name == "second"
+
+
+async def test_missing_version_never_matches_earlier_entries(redis_client):
+    worker = UserCacheService(10, 60)
+    loader = Loader(make_user("first"))
+    await worker.get(1, loader)
+
+    loader.user = make_user("second")
+    await redis_client.delete(worker._generate_version_key(1))
+    assert (await worker.get(1, loader)).user_name == "second"